@@ -1,46 +1,41 @@
-print('graph {')
+import sys
 
 dim = 3
 
 def out_of_bounds(axis):
     return axis < 0 or axis >= dim 
 
+out = ['graph {']
+
 for y in range(-1, dim + 1):
     for x in range(-1, dim + 1):
         out_x = out_of_bounds(x)
         out_y = out_of_bounds(y)
 
-        node_str = ('\t"' + str((x, y)) + '" ['
-                    + 'pos="' + str(1.75*x) + ',' + str(1.75*y) + '!" '
+        node_str = (f'\t"{(x, y)}" [pos="{1.75*x},{1.75*y}!" '
                     + 'width=0.75 height=0.75 fixedsize=True')
         if out_x or out_y:
-            node_str += (' style="dashed" label="' +
-                         str((x % dim, y % dim)) + '"')
+            node_str += f' style="dashed" label="{(x % dim, y % dim)}"'
         node_str += ']'
 
-        print(node_str)
+        out.append(node_str)
 
-print()
+out.append('')
 
 for y in range(dim):
     for x in range(dim):
-        tail = str((x, y))
+        tail = (x, y)
         for d in [0, 2]:
             x_shift = 1 if d // 2 == 0 else -1
             y_shift = 1 if d % 2 == 0 else -1
-            head = str((x + x_shift, y + y_shift))
-
-            arc_str = '\t "' + tail + '" -- "' + head + '";'
-            print(arc_str)
+            head = (x + x_shift, y + y_shift)
+            out.append(f'\t "{tail}" -- "{head}";')
 
         if x == 0 or y == 0:
-            head = str((x -1, y - 1))
-            arc_str = '\t "' + tail + '" -- "' + head + '";'
-            print(arc_str)
+            out.append(f'\t "{tail}" -- "{(x - 1, y - 1)}";')
 
         if y == 0 or x == dim - 1:
-            head = str((x + 1, y - 1))
-            arc_str = '\t "' + tail + '" -- "' + head + '";'
-            print(arc_str)
+            out.append(f'\t "{tail}" -- "{(x + 1, y - 1)}";')
 
-print('}')
+out.append('}')
+sys.stdout.write('\n'.join(out) + '\n')
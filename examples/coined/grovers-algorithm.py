@@ -1,11 +1,9 @@
 import hiperwalk as hpw
 import numpy as np
-import networkx as nx
 
 N = 128
-K_N = nx.complete_graph(N)
-A = nx.adjacency_matrix(K_N)+np.eye(N)
-graph = hpw.Graph(A)
+# complete graph with loops
+graph = hpw.Graph(np.ones((N, N)))
 qw = hpw.Coined(graph, shift='flipflop', coin='G', marked={'-G': [0]})
 t_final = round(4*np.pi*np.sqrt(N)/4) + 1
 states = qw.simulate(range=t_final,
@@ -1,6 +1,21 @@
 import numpy as np
 from .graph import Graph
 
+def _find_pairs(tails, heads, query_tails, query_heads, num_vert):
+    r"""
+    Return the index ``i`` such that ``(tails[i], heads[i])`` equals
+    ``(query_tails[j], query_heads[j])`` for every ``j``.
+
+    Every queried pair must exist.
+    If a pair is repeated, the first index is returned.
+    """
+    keys = np.asarray(tails, dtype=np.int64)*num_vert + heads
+    order = np.argsort(keys, kind="stable")
+    index = np.searchsorted(keys[order],
+                            np.asarray(query_tails, dtype=np.int64)*num_vert
+                            + query_heads)
+    return order[index]
+
 class SDMultigraph(Graph):
     r"""
     Class for managing symmetric directed multigraph.
@@ -12,6 +27,11 @@ class SDMultigraph(Graph):
     def __init__(self, graph):
         # underlying multigraph
         self.graph = graph
+        # the underlying graph does not change,
+        # number_of_arcs() is computed only once
+        self._num_arcs = None
+        # labels already returned by arc_number()
+        self._arc_labels = {}
 
     def arc(self, number):
         r"""
@@ -71,27 +91,33 @@ class SDMultigraph(Graph):
         >>> graph.arc_number((0, 1)) #arc as tuple
         0
         """
-        try:
-            tail = self.vertex_number(arc[0])
-            head = self.vertex_number(arc[1])
-            out_degree = 1
-            multiedge = 0
-
-            if not self.is_underlying_simple():
-                # multigraph
-                out_degree = self.graph.number_of_edges(tail, head)
-                multiedge = arc[2]
-
-            entry = self.graph._entry(tail, head)
-            entry += multiedge - out_degree
+        if isinstance(arc, (int, np.integer)):
+            # arc is already a label
+            return arc
+
+        tail = self.vertex_number(arc[0])
+        head = self.vertex_number(arc[1])
+        simple = self.is_underlying_simple()
+        key = (tail, head) if simple else (tail, head, arc[2])
+
+        # the underlying graph does not change,
+        # hence the labels are memoized
+        entry = self._arc_labels.get(key)
+        if entry is not None:
             return entry
 
-        except (TypeError, IndexError):
-            # TypeError if python int
-            # IndexError if numpy int
-            return arc
+        out_degree = 1
+        multiedge = 0
+
+        if not simple:
+            # multigraph
+            out_degree = self.graph.number_of_edges(tail, head)
+            multiedge = arc[2]
 
-        raise NotImplementedError("arc_number() for multigraphs.")
+        entry = self.graph._entry(tail, head)
+        entry += multiedge - out_degree
+        self._arc_labels[key] = entry
+        return entry
 
     def arcs_with_tail(self, tail):
         r"""
@@ -115,6 +141,101 @@ class SDMultigraph(Graph):
             return arcs
 
 
+    def _arcs_indptr(self):
+        r"""
+        Return the arcs pointer array.
+
+        The labels of the arcs with tail ``v`` are
+        ``indptr[v]``, ..., ``indptr[v + 1] - 1``.
+        """
+        adj_matrix = self.graph._adj_matrix
+        if adj_matrix is None:
+            # adjacency matrix is not stored (e.g. complete graphs)
+            g = self.graph
+            num_vert = g.number_of_vertices()
+            indptr = np.zeros(num_vert + 1, dtype=np.int64)
+            np.cumsum([g.degree(v) for v in range(num_vert)],
+                      out=indptr[1:])
+            return indptr
+
+        if self.is_underlying_simple():
+            return adj_matrix.indptr
+
+        # multigraph: data stores the cumulative number of arcs
+        data = np.concatenate(([0], adj_matrix.data))
+        return data[adj_matrix.indptr]
+
+    def _arcs_heads(self):
+        r"""
+        Return the heads of all arcs.
+
+        ``heads[a]`` is the head of the arc with label ``a``.
+        """
+        adj_matrix = self.graph._adj_matrix
+        if adj_matrix is None:
+            # adjacency matrix is not stored (e.g. complete graphs)
+            g = self.graph
+            return np.concatenate([g.neighbors(v)
+                                   for v in range(g.number_of_vertices())])
+
+        if self.is_underlying_simple():
+            return adj_matrix.indices
+
+        # multigraph: the head is repeated for every multiarc
+        data = np.concatenate(([0], adj_matrix.data))
+        return np.repeat(adj_matrix.indices, np.diff(data))
+
+    def _arcs_tails(self):
+        r"""
+        Return the tails of all arcs.
+
+        ``tails[a]`` is the tail of the arc with label ``a``.
+        """
+        indptr = self._arcs_indptr()
+        return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    def _arc_numbers(self, tails, heads):
+        r"""
+        Return the numerical labels of the arcs ``(tails[i], heads[i])``.
+
+        Vectorized version of :meth:`arc_number`.
+        Only valid if the underlying graph is simple.
+        """
+        # Arcs are labeled by tail and then in the order of neighbors,
+        # which is not necessarily sorted.
+        # Hence, the labels are found by
+        # searching the sorted (tail, head) keys.
+        return _find_pairs(self._arcs_tails(), self._arcs_heads(),
+                           tails, heads, self.number_of_vertices())
+
+    def _reverse_arcs(self):
+        r"""
+        Return the reverse of every arc.
+
+        ``rev[a]`` is the label of the arc ``(head, tail)``
+        where ``(tail, head)`` is the arc with label ``a``.
+        For multigraphs, the ``i``-th multiarc ``(tail, head)``
+        is reversed to the ``i``-th multiarc ``(head, tail)``.
+        """
+        if self.is_underlying_simple():
+            return self._arc_numbers(self._arcs_heads(), self._arcs_tails())
+
+        # multigraph: find the reverse of every adjacency matrix entry
+        adj_matrix = self.graph._adj_matrix
+        indptr = adj_matrix.indptr
+        num_vert = len(indptr) - 1
+        rows = np.repeat(np.arange(num_vert), np.diff(indptr))
+        rev_entry = _find_pairs(rows, adj_matrix.indices,
+                                adj_matrix.indices, rows, num_vert)
+
+        # data stores the cumulative number of arcs
+        first_arc = np.concatenate(([0], adj_matrix.data[:-1]))
+        num_multiarcs = adj_matrix.data - first_arc
+        arc_entry = np.repeat(np.arange(len(first_arc)), num_multiarcs)
+        multiarc = np.arange(adj_matrix.data[-1]) - first_arc[arc_entry]
+
+        return first_arc[rev_entry[arc_entry]] + multiarc
+
     def number_of_arcs(self):
         r"""
         Determine the cardinality of the arc set.
@@ -124,14 +245,20 @@ class SDMultigraph(Graph):
         However, for graphs containing loops, the 
         cardinality is incremented by one for each loop.
         """
+        if self._num_arcs is not None:
+            return self._num_arcs
+
         if self.is_underlying_simple():
             try:
-                return self.graph._adj_matrix.indptr[-1]
+                num_arcs = self.graph._adj_matrix.indptr[-1]
             except AttributeError:
                 num_edges = self.number_of_edges() << 1
-                return  num_edges - self.number_of_loops()
+                num_arcs = num_edges - self.number_of_loops()
+        else:
+            num_arcs = self.graph._adj_matrix.data[-1]
 
-        return self.graph._adj_matrix.data[-1]
+        self._num_arcs = num_arcs
+        return num_arcs
 
     def is_underlying_simple(self):
         r"""
@@ -180,6 +307,36 @@ class SDMultigraph(Graph):
         """
         return False
 
+    def _previous_arcs(self):
+        r"""
+        Return the previous arc of every arc.
+
+        Vectorized version of :meth:`previous_arc`:
+        ``prev[a] == self.previous_arc(a)``.
+        Returns ``None`` if the previous arc is not defined.
+        """
+        g = self.graph
+
+        if (not g.is_simple() or not hasattr(g, '_basis')):
+            return None
+
+        dim = g._dim
+        tails = self._arcs_tails()
+        # coordinates, one vertex per row
+        tail = np.array(np.unravel_index(tails, dim)).T
+        head = np.array(np.unravel_index(self._arcs_heads(), dim)).T
+
+        # prev_tail = tail - direction
+        prev_tail = 2*tail - head
+        if g._periodic:
+            prev_tail %= dim
+        else:
+            invalid = np.any((prev_tail < 0) | (prev_tail >= dim), axis=1)
+            prev_tail[invalid] = head[invalid]
+
+        prev_tail = np.ravel_multi_index(prev_tail.T, dim)
+        return self._arc_numbers(prev_tail, tails)
+
     def previous_arc(self, arc):
         g = self.graph
 
@@ -171,9 +171,7 @@ class Graph():
     #     return np.int8
 
     def _count_loops(self, adj_matrix):
-        loops = [adj_matrix[v, v] != 0
-                 for v in range(adj_matrix.shape[0])]
-        self._num_loops = np.sum(loops)
+        self._num_loops = np.count_nonzero(adj_matrix.diagonal())
 
     def _set_adj_matrix(self, adj_matrix):
         del adj_matrix.data
@@ -252,7 +250,8 @@ class Graph():
         adj_matrix = self._adj_matrix
 
         head = adj_matrix.indices[entry]
-        tail = _interval_binary_search(adj_matrix.indptr, entry)
+        # same as _interval_binary_search(adj_matrix.indptr, entry)
+        tail = np.searchsorted(adj_matrix.indptr, entry, side='right') - 1
 
         return (tail, head)
 
@@ -148,10 +148,11 @@ def Hypercube(dim, multiedges=None, weights=None, copy=False):
     num_vert = 1 << dim
     num_arcs = dim*num_vert
 
-    data = np.ones(num_arcs, dtype=np.int64)
-    indptr = np.arange(0, num_arcs + 1, dim)
+    data = np.ones(num_arcs, dtype=np.int8)
+    indptr = np.arange(0, num_arcs + 1, dim, dtype=np.int32)
     indices = np.array([v ^ 1 << shift for v in range(num_vert)
-                                       for shift in range(dim)])
+                                       for shift in range(dim)],
+                       dtype=np.int32)
     adj_matrix = csr_array((data, indices, indptr),
                            shape=(num_vert, num_vert))
     g = Graph(adj_matrix, copy=False)
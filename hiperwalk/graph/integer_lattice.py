@@ -1,7 +1,6 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from scipy.sparse import csr_array
-from scipy.sparse import eye as sparse_eye
 from .graph import Graph
 from types import MethodType
 from .multigraph import Multigraph
@@ -45,70 +44,80 @@ def __generate_valid_basis(euc_dim, basis=None):
 
 def __create_adj_matrix(graph):
     num_vert = graph.number_of_vertices()
+    dim = graph._dim
+    basis = graph._basis
 
-    indices = [[]]*num_vert
-    indptr = np.zeros(num_vert + 1, dtype=np.int32)
-
-    for v in range(num_vert):
-        coord = graph.vertex_coordinates(v)
-
-        neigh = np.array([coord + graph._basis[i]
-                          for i in range(len(graph._basis))])
-
-        if not graph._periodic:
-            adj = [graph._valid_vertex(n, exception=False)
-                   for n in neigh]
-            neigh = neigh[adj]
-
-        indices[v] = [graph.vertex_number(n) for n in neigh]
-        indptr[v + 1] = indptr[v] + len(neigh)
+    # coordinates of all vertices, one vertex per row
+    coords = np.array(np.unravel_index(np.arange(num_vert), dim)).T
+    # neigh[v, i] is the i-th neighbor of v w.r.t. the basis order
+    neigh = coords[:, None, :] + basis[None, :, :]
 
     if graph._periodic:
-        indices = np.reshape(indices, indptr[-1])
-    else:
-        indices = np.array([elem for l in indices for elem in l],
+        neigh %= dim
+        # every vertex has exactly len(basis) neighbors
+        indptr = np.arange(0, num_vert*len(basis) + 1, len(basis),
                            dtype=np.int32)
+    else:
+        valid = np.all((neigh >= 0) & (neigh < dim), axis=2)
+        # boolean indexing keeps the row-major (vertex, basis) order
+        neigh = neigh[valid]
+        indptr = np.zeros(num_vert + 1, dtype=np.int32)
+        np.cumsum(np.sum(valid, axis=1), out=indptr[1:])
+
+    neigh = neigh.reshape(-1, graph._euc_dim)
+    indices = np.ravel_multi_index(neigh.T, dim).astype(np.int32)
     data = np.ones(indptr[-1], dtype=np.int8)
 
-    adj_matrix = csr_array((data, indices, indptr), copy=False)
+    # the rows are already in the order of neighbors,
+    # hence the CSR arrays are used as they are
+    adj_matrix = csr_array((data, indices, indptr),
+                           shape=(num_vert, num_vert), copy=False)
     return adj_matrix
 
-def _valid_vertex(self, vertex, exception=False):
-    try:
-        # coordinates
-        if len(vertex) != self._euc_dim:
-            if not exception:
-                return False
-            raise ValueError("Vertex is not a "
-                             + str(self._euc_dim)
-                             + "-tuple.")
+def _wrap(x, n):
+    # Periodic coordinates are usually off by at most one period
+    # (e.g. neighbors of border vertices),
+    # which is handled without computing the remainder.
+    if x >= n:
+        return x - n if x < 2*n else x % n
+    if x < 0:
+        return x + n if x >= -n else x % n
+    return x
 
-        if self._periodic:
-            return True
-
-        for i in range(self._euc_dim):
-            if vertex[i] < 0 or vertex[i] >= self._dim[i]:
-                if not exception:
-                    return False
-                raise ValueError("Inexistent vertex"
-                                 + str(vertex) + ". "
-                                 + "Lattice is not periodic.")
-
-    except TypeError:
+def _valid_vertex(self, vertex, exception=False):
+    if np.ndim(vertex) == 0:
         # number
         if vertex < 0 or vertex >= self.number_of_vertices():
             if not exception:
                 return False
             raise ValueError("Inexistent vertex " + str(vertex))
+        return True
+
+    # coordinates
+    if len(vertex) != self._euc_dim:
+        if not exception:
+            return False
+        raise ValueError("Vertex is not a "
+                         + str(self._euc_dim)
+                         + "-tuple.")
+
+    if self._periodic:
+        return True
+
+    for i in range(self._euc_dim):
+        if vertex[i] < 0 or vertex[i] >= self._dim[i]:
+            if not exception:
+                return False
+            raise ValueError("Inexistent vertex"
+                             + str(vertex) + ". "
+                             + "Lattice is not periodic.")
 
     return True
 
 def vertex_number(self, coordinates):
     self._valid_vertex(coordinates, exception=True)
     # number
-    try:
-        len(coordinates)
-    except TypeError:
+    if np.ndim(coordinates) == 0:
         return coordinates
 
     # coordinates
@@ -118,7 +127,7 @@ def vertex_number(self, coordinates):
     number = 0
     for i in range(self._euc_dim - 1, -1, -1):
         if self._periodic:
-            coordinates[i] = coordinates[i] % self._dim[i]
+            coordinates[i] = _wrap(coordinates[i], dim[i])
 
         number += mult*coordinates[i]
         mult *= dim[i]
@@ -174,17 +183,13 @@ def vertex_coordinates(self, vertex):
     dim = self._dim.copy()
 
     # coordinates
-    try:
-        len(vertex)
+    if np.ndim(vertex) > 0:
         if self._periodic:
             for i in range(self._euc_dim):
-                vertex[i] = vertex[i] % dim[i]
+                vertex[i] = _wrap(vertex[i], dim[i])
 
         return vertex
 
-    except TypeError:
-        pass
-
     # input is number
     mult = np.prod(dim, dtype=np.int64)
     coordinates = np.zeros(self._euc_dim, dtype=np.int32)
@@ -348,7 +353,11 @@ def IntegerLattice(dim, basis=None, periodic=True,
     num_vert = np.prod(dim)
 
     # create toy graph
-    g = Graph(sparse_eye(num_vert).tocsr())
+    toy_indices = np.arange(num_vert, dtype=np.int32)
+    g = Graph(csr_array((np.ones(num_vert, dtype=np.int8),
+                         toy_indices,
+                         np.arange(num_vert + 1, dtype=np.int32)),
+                        shape=(num_vert, num_vert), copy=False))
 
     # modify toy graph to IntegerLattice
     g._dim = dim
@@ -63,9 +63,7 @@ class Multigraph(Graph):
     #     return np.int32
 
     def _count_loops(self, adj_matrix):
-        loops = [adj_matrix[v, v]
-                 for v in range(adj_matrix.shape[0])]
-        self._num_loops = np.sum(loops)
+        self._num_loops = np.sum(adj_matrix.diagonal())
 
     def _set_adj_matrix(self, adj_matrix):
         # if not np.issubdtype(adj_matrix.dtype, self._default_dtype()):
@@ -88,10 +86,12 @@ class Multigraph(Graph):
 
     def _find_entry(self, entry):
         adj_matrix = self._adj_matrix
-        index = _interval_binary_search(adj_matrix.data, entry) + 1
+        # searchsorted(v, elem, side='right') - 1 is equivalent to
+        # _interval_binary_search(v, elem)
+        index = np.searchsorted(adj_matrix.data, entry, side='right')
 
         col = adj_matrix.indices[index]
-        row = _interval_binary_search(adj_matrix.indptr, index)
+        row = np.searchsorted(adj_matrix.indptr, index, side='right') - 1
 
         return (row, col)
 
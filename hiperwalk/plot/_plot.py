@@ -2,11 +2,11 @@ import networkx as nx #TODO: import only needed functions?
 import matplotlib.pyplot as plt
 import numpy as np
 import re
-from PIL import Image
-from ..graph import *
+from ..graph import Graph
 from ..quantum_walk import QuantumWalk
 from matplotlib.animation import FuncAnimation
-from scipy.sparse import csr_array
+from matplotlib.collections import PathCollection
+from scipy.sparse import issparse
 
 python_range = range
 
@@ -164,6 +164,14 @@ def plot_probability_distribution(
             the length of ``node_size`` must match ``probabilities``.
             The ``node_size`` argument is ignored if both
             ``min_node_size`` and ``max_node_size`` are set.
+        fast_layout : bool, default=False
+            If ``True`` and neither ``pos`` nor ``graph_layout`` is set,
+            a layout that is cheaper than the default
+            Kamada-Kawai layout is used.
+            The vertices of integer lattices (e.g. cycles, lines and grids)
+            are placed at their coordinates;
+            otherwise, :obj:`networkx.spring_layout` is used
+            with few iterations.
         cmap : str, optional
             A colormap for representing vertices probabilities.
             if ``cmap='default'``, uses the ``'viridis'`` colormap.
@@ -237,6 +245,11 @@ def plot_probability_distribution(
             '. One of the following was expected: ' + str(valid_plots)
         )
 
+    # hiperwalk-specific kwarg only used by graph plots,
+    # it must not reach matplotlib
+    if plot != 'graph':
+        kwargs.pop('fast_layout', None)
+
     # dictionaries for function pointers
     # preconfiguration: executed once before the loop starts
     preconfigs = {valid_plots[0]: _preconfigure_plot,
@@ -270,10 +283,14 @@ def plot_probability_distribution(
 
     # preparing probabilities to shape requested by called functions
     if len(probabilities.shape) == 1:
-        probabilities = np.array([probabilities])
+        # 2-dimensional view, no copy
+        probabilities = probabilities[np.newaxis, :]
 
     # passes kwargs by reference to be updated accordingly
     preconfigs[plot](probabilities, kwargs)
+    if plot == 'bar' or plot == 'line' or plot == 'histogram':
+        # vertices in the x axis: shared by every frame
+        kwargs['x_axis'] = np.arange(probabilities.shape[1])
 
     # matches a valid filename
     filename_with_ext_pattern = re.compile(r'(.+)\.(.{3,4})$')
@@ -284,14 +301,36 @@ def plot_probability_distribution(
             t = QuantumWalk._range_to_tuple(range)
             t = time_step*np.arange(*t)
 
+        # If the images are not shown, a single figure is created and
+        # its artists are updated for every step
+        # (as done for animations) instead of creating a new figure.
+        reuse_figure = not show and update_animation[plot] is not None
+        artists = None
+
         for i in python_range(len(probabilities)):
-            # TODO: set figure size according to graph dimensions
-            # TODO: check for kwargs
-            fig, ax = configs[plot](fig_width=fig_width,
-                                    fig_height=fig_height,
-                                    dpi=dpi)
+            if artists is not None:
+                update_animation[plot](
+                    probabilities[i], artists, None,
+                    None if range is None else iter(t[i:i + 1]))
+                if (kwargs.get('min_prob') is None
+                        or kwargs.get('max_prob') is None):
+                    # the limits are not fixed by
+                    # _posconfigure_plot_figure, hence they are
+                    # rescaled as in a newly created figure
+                    ax.relim()
+                    ax.autoscale_view()
 
-            plot_funcs[plot](probabilities[i], ax, time=t[i], **kwargs)
+            else:
+                # TODO: set figure size according to graph dimensions
+                # TODO: check for kwargs
+                fig, ax = configs[plot](fig_width=fig_width,
+                                        fig_height=fig_height,
+                                        dpi=dpi)
+
+                ret = plot_funcs[plot](probabilities[i], ax, time=t[i],
+                                       **kwargs)
+                if reuse_figure:
+                    artists = ret
 
             plt.tight_layout()
 
@@ -308,11 +347,14 @@ def plot_probability_distribution(
                 else:
                     plt.savefig(fname if len(probabilities) == 1
                                 else fname + '-' + filename_suffix)
-                if not show:
+                if not show and not reuse_figure:
                     plt.close()
             if show:
                 plt.show()
 
+        if fname is not None and reuse_figure:
+            plt.close(fig)
+
     else:
         fig, ax = configs[plot](fig_width=fig_width,
                                 fig_height=fig_height,
@@ -348,11 +390,15 @@ def plot_probability_distribution(
             from functools import partial
             ax, cbar = plot_funcs[plot](probabilities[0], ax,
                                         **kwargs)
+            # the graph is drawn only once,
+            # only the nodes are updated in each frame
+            nodes = next(c for c in ax.collections
+                         if isinstance(c, PathCollection))
 
             anim = FuncAnimation(
                     fig,
-                    partial(plot_funcs[plot], ax=ax, cbar=cbar,
-                            time=t, **kwargs),
+                    partial(_update_animation_graph, nodes=nodes, ax=ax,
+                            cbar=cbar, time=t, kwargs=kwargs),
                     frames=probabilities,
                     interval=interval,
                     repeat=repeat,
@@ -407,6 +453,8 @@ def _default_graph_kwargs(kwargs, plot):
             plot = 'plane'
         if plot == 'plane' and 'dimensions' not in kwargs:
             kwargs['dimensions'] = graph.dimensions()
+        if plot == 'graph':
+            _lattice_layout(graph, kwargs)
         return plot
 
     # Hiperwalk Hypercube
@@ -440,10 +488,16 @@ def _default_graph_kwargs(kwargs, plot):
         return plot
 
     # other graphs
+    if plot == 'graph' and hasattr(graph, '_euc_dim'):
+        _lattice_layout(graph, kwargs)
+
     if hasattr(graph, 'number_of_vertices'):
-        nx_graph = nx.Graph(graph.adjacency_matrix())
+        nx_graph = nx.from_scipy_sparse_array(graph.adjacency_matrix())
     elif hasattr(graph, 'number_of_nodes'):
         nx_graph = graph
+    elif issparse(graph):
+        # avoid generic conversion (which may create a dense matrix)
+        nx_graph = nx.from_scipy_sparse_array(graph)
     else:
         nx_graph = nx.Graph(graph)
 
@@ -452,6 +506,28 @@ def _default_graph_kwargs(kwargs, plot):
     return plot
 
 
+def _lattice_layout(graph, kwargs):
+    """
+    Use the coordinates of the vertices of a hiperwalk integer lattice
+    as positions if ``fast_layout`` is requested.
+
+    The positions are only set if the user did not specify
+    ``pos`` nor ``graph_layout``.
+    """
+    if (not kwargs.get('fast_layout', False) or graph._euc_dim > 2
+        or 'pos' in kwargs or 'graph_layout' in kwargs
+    ):
+        return
+
+    num_vert = graph.number_of_vertices()
+    coords = np.array(np.unravel_index(np.arange(num_vert),
+                                       graph.dimensions())).T
+    if graph._euc_dim == 1:
+        coords = np.column_stack((coords, np.zeros(num_vert, dtype=int)))
+
+    kwargs['pos'] = dict(zip(python_range(num_vert), coords))
+
+
 def _preconfigure_plot(probabilities, kwargs):
     """
     Configure static parameters for matplotlib plot.
@@ -504,7 +580,7 @@ def _preconfigure_graph_plot(probabilities, kwargs):
         raise KeyError("'graph' kwarg not provided.")
 
     graph = kwargs['graph']
-    if isinstance(graph, csr_array):
+    if issparse(graph):
         kwargs['graph'] = nx.from_scipy_sparse_array(graph)
     elif isinstance(graph, Graph):
         adj_matrix = graph.adjacency_matrix()
@@ -515,6 +591,22 @@ def _preconfigure_graph_plot(probabilities, kwargs):
     if 'max_node_size' not in kwargs:
         kwargs['max_node_size'] = None
 
+    if 'node_size' not in kwargs:
+        if kwargs['min_node_size'] is None:
+            kwargs['min_node_size'] = 300
+        if kwargs['max_node_size'] is None:
+            kwargs['max_node_size'] = 3000
+
+    # The node sizes are given by a linear function of the probability.
+    # If the reference probabilities do not change between steps,
+    # neither does its slope, so it is computed once.
+    if (not kwargs['rescale'] and kwargs['min_node_size'] is not None
+        and kwargs['max_node_size'] is not None
+    ):
+        kwargs['_size_slope'] = (
+            (kwargs['max_node_size'] - kwargs['min_node_size'])
+            / (kwargs['max_prob'] - kwargs['min_prob']))
+
     # setting static kwargs for plotting
     # kwargs dictionary is updated by reference
     # TODO: change ConfigureNodes parameters
@@ -588,7 +680,7 @@ def _configure_plane_figure(fig_width,
 
 def _plot_probability_distribution_on_bars(
         probabilities, ax, labels=None, graph=None,
-        min_prob=None, max_prob=None, time=None, **kwargs
+        min_prob=None, max_prob=None, time=None, x_axis=None, **kwargs
     ):
     """
     Plot probability distribution using matplotlib bar plot.
@@ -602,6 +694,9 @@ def _plot_probability_distribution_on_bars(
     {labels, graph, min_prob, max_prob} : optional
         Final configuration parameters.
         Refer to _posconfigure_plot_figure.
+    x_axis : :class:`numpy.ndarray`, optional
+        x coordinates (vertices) of the plot.
+        If ``None``, ``np.arange(len(probabilities))`` is used.
     **kwargs : dict, optional
         Extra parameters for plotting. Refer to matplotlib.pyplot.bar
 
@@ -611,7 +706,9 @@ def _plot_probability_distribution_on_bars(
     matplotlib.pyplot.bar
     """
 
-    bars = plt.bar(np.arange(len(probabilities)), probabilities, **kwargs)
+    if x_axis is None:
+        x_axis = np.arange(len(probabilities))
+    bars = plt.bar(x_axis, probabilities, **kwargs)
     _posconfigure_plot_figure(ax, len(probabilities), labels, graph,
                              min_prob, max_prob, time)
     return [bars]
@@ -657,7 +754,7 @@ def _plot_probability_distribution_on_histogram(
 
 def _plot_probability_distribution_on_line(
         probabilities, ax, labels=None, graph=None,
-        min_prob=None, max_prob=None, time=None, **kwargs
+        min_prob=None, max_prob=None, time=None, x_axis=None, **kwargs
     ):
     """
     Plots probability distribution using matplotlib's line plot.
@@ -671,6 +768,9 @@ def _plot_probability_distribution_on_line(
     {labels, graph, min_prob, max_prob} : optional
         Final configuration parameters.
         Refer to _posconfigure_plot_figure.
+    x_axis : :class:`numpy.ndarray`, optional
+        x coordinates (vertices) of the plot.
+        If ``None``, ``np.arange(len(probabilities))`` is used.
     **kwargs : dict, optional
         Extra parameters for plotting. Refer to matplotlib.pyplot.plot
 
@@ -680,7 +780,9 @@ def _plot_probability_distribution_on_line(
     matplotlib.pyplot.plot
     """
 
-    line = plt.plot(np.arange(len(probabilities)),
+    if x_axis is None:
+        x_axis = np.arange(len(probabilities))
+    line = plt.plot(x_axis,
                      probabilities, **kwargs)
 
     _posconfigure_plot_figure(
@@ -814,6 +916,39 @@ def _plot_probability_distribution_on_graph(probabilities, ax, time=None,
     return [ax, cbar]
 
 
+def _update_animation_graph(frame, nodes, ax, cbar, time, kwargs):
+    """
+    Update the nodes of a graph previously drawn by
+    _plot_probability_distribution_on_graph.
+
+    Edges, labels and positions do not depend on the probabilities,
+    hence only the sizes and colors of the nodes are changed.
+    """
+    kwargs = dict(kwargs)
+    rescale = kwargs['rescale']
+    _update_nodes(frame, kwargs.pop('min_node_size'),
+                  kwargs.pop('max_node_size'), kwargs)
+
+    if 'node_size' in kwargs:
+        nodes.set_sizes(np.ravel(kwargs['node_size']))
+
+    if 'cmap' in kwargs:
+        if rescale:
+            kwargs['min_prob'] = 0
+            kwargs['max_prob'] = frame.max()
+        # as in a redraw, the colorbar is updated (and its ticks reset)
+        # even if the limits do not change
+        _configure_colorbar(ax, cbar, kwargs)
+
+        nodes.set_array(frame)
+        nodes.set_clim(kwargs['min_prob'], kwargs['max_prob'])
+
+    if time is not None:
+        ax.set_title('Time: ' + str(next(time)), loc='right')
+
+    return [nodes]
+
+
 def _configure_nodes(G, probabilities, kwargs):
     """
     Configure static attributes of nodes.
@@ -859,10 +994,15 @@ def _configure_nodes(G, probabilities, kwargs):
     # the user may call any networkx graph layout function
     # BEFORE calling plot_probability_distribution and
     # using its return as the 'pos' kwarg.
+    fast_layout = kwargs.pop('fast_layout', False)
     if 'pos' not in kwargs:
         if 'graph_layout' in kwargs:
             func = kwargs.pop('graph_layout')
             kwargs['pos'] = func(G)
+        elif fast_layout:
+            # few iterations of a force-directed layout
+            # instead of solving Kamada-Kawai's optimization problem
+            kwargs['pos'] = nx.spring_layout(G, iterations=20, seed=0)
         else:
             kwargs['pos'] = nx.kamada_kawai_layout(G)
 
@@ -886,13 +1026,10 @@ def _update_nodes(probabilities, min_node_size, max_node_size, kwargs):
     if 'cmap' in kwargs:
         kwargs['node_color'] = probabilities
 
-    if 'node_size' not in kwargs:
-        if min_node_size is None:
-            min_node_size = 300
-        if max_node_size is None:
-            max_node_size = 3000
-
+    # the default sizes are set by _preconfigure_graph_plot
     if min_node_size is not None and max_node_size is not None:
+        # precomputed by _preconfigure_graph_plot if not rescaling
+        a = kwargs.pop('_size_slope', None)
         if ('rescale' in kwargs and kwargs.pop('rescale')):
             kwargs['min_prob'] = 0
             kwargs['max_prob'] = probabilities.max()
@@ -900,11 +1037,10 @@ def _update_nodes(probabilities, min_node_size, max_node_size, kwargs):
         # calculating size of each node acording to probability 
         # as a function f(x) = ax + b where b = min_size and
         # max_size = a*(max_prob-min_prob) + min_size
-        a = ((max_node_size - min_node_size)
-             / (kwargs['max_prob'] - kwargs['min_prob']))
-        kwargs['node_size'] = list(map(
-            lambda x: a*x + min_node_size, probabilities
-        ))
+        if a is None:
+            a = ((max_node_size - min_node_size)
+                 / (kwargs['max_prob'] - kwargs['min_prob']))
+        kwargs['node_size'] = a*np.asarray(probabilities) + min_node_size
 
 
 def _configure_colorbar(ax, cbar, kwargs):
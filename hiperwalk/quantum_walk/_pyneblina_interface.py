@@ -13,6 +13,9 @@ import atexit
 
 __engine_initiated = False
 __hpc_type = None
+# number of times the engine was initiated,
+# objects sent to a previous engine are not valid
+__engine_count = 0
 
 def set_hpc(hpc):
     r"""
@@ -61,6 +64,16 @@ def get_hpc():
 
     return None
 
+def engine_id():
+    r"""
+    Identifier of the current engine.
+
+    Matrices and vectors sent to the engine
+    can only be used while ``engine_id()`` does not change.
+    """
+    global __engine_count
+    return __engine_count
+
 def exit_handler():
     global __engine_initiated
     if __engine_initiated:
@@ -77,6 +90,7 @@ def _init_engine():
     """
     global __engine_initiated
     global __hpc_type
+    global __engine_count
     if not __engine_initiated and __hpc_type is not None:
         # TODO: if not 'neblina' in sys.modules raise ModuleNotFoundError
         neblina_imported = True
@@ -90,6 +104,7 @@ def _init_engine():
                 + "Do you have neblina-core and pyneblina installed?"
             )
         __engine_initiated = True
+        __engine_count += 1
 
 def send_vector(v):
     r"""
@@ -165,21 +180,29 @@ def _send_sparse_matrix(M):
     smat = (neblina.sparse_matrix_new(n, n, neblina.COMPLEX) if is_complex
             else neblina.sparse_matrix_new(n, n, neblina.FLOAT))
 
+    # M[row, col] searches the row for every entry,
+    # the CSR arrays are read directly instead.
+    # Python floats avoid converting numpy scalars at every call.
+    indptr = M.indptr.tolist()
+    indices = M.indices.tolist()
+    real = M.data.real.tolist()
+    imag = M.data.imag.tolist() if is_complex else None
+
     for row in range(n):
-        start = M.indptr[row]
-        end = M.indptr[row + 1]
+        start = indptr[row]
+        end = indptr[row + 1]
 
         # columns must be added in reverse order
         for index in range(end - 1, start - 1, -1):
-            col = M.indices[index]
+            col = indices[index]
 
             if is_complex:
                 neblina.sparse_matrix_set(smat, row, col,
-                                          M[row, col].real,
-                                          M[row, col].imag)
+                                          real[index],
+                                          imag[index])
             else:
                 neblina.sparse_matrix_set(smat, row, col,
-                                          M[row, col].real, 0)
+                                          real[index], 0)
 
     neblina.sparse_matrix_pack(smat)
     neblina.move_sparse_matrix_device(smat)
@@ -240,6 +263,48 @@ def multiply_matrix_vector(nbl_mat, nbl_vec, is_sparse):
 
     return nbl_vec
 
+def multiply_matrix_vector_n(nbl_mat, nbl_vec, is_sparse, n):
+    """
+    Request ``n`` consecutive matrix multiplications to neblina.
+
+    Multiplies the matrix by the vector ``n`` times,
+    i.e. ``mat @ ... @ mat @ vec``.
+    Only the resulting vector is returned.
+
+    Parameters
+    ----------
+    nbl_mat : :class:`PyNeblinaMatrix`
+        neblina matrix object
+    nbl_vec : :class:`PyNeblinaVector`
+        neblina vector object
+    is_sparse : bool
+        Whether ``mat`` is a sparse matrix.
+    n : int
+        Number of multiplications.
+
+    Returns
+    -------
+    Neblina vector object resulted from the last multiplication.
+
+    See Also
+    --------
+    multiply_matrix_vector
+
+    Notes
+    -----
+    pyneblina has no call for repeated multiplications.
+    Hence, this function calls the neblina multiplication ``n`` times
+    and does not reduce the number of calls to neblina-core.
+    It only selects the sparse or dense multiplication once
+    and keeps the vectors in the device between multiplications.
+    """
+    matvec_mul = (neblina.sparse_matvec_mul if is_sparse
+                  else neblina.matvec_mul)
+    for i in range(n):
+        nbl_vec = matvec_mul(nbl_vec, nbl_mat)
+
+    return nbl_vec
+
 def multiply_matrices(nbl_A, nbl_B):
     return neblina.mat_mul(nbl_A, nbl_B)
 
@@ -1,12 +1,35 @@
 import numpy as np
 import scipy
 import scipy.sparse
+import scipy.sparse.linalg
 import networkx as nx
+from functools import lru_cache, wraps
 from .quantum_walk import QuantumWalk
 from ..graph import SDMultigraph
 from scipy.linalg import hadamard, dft
 from . import _pyneblina_interface as nbl
 
+def _cached_coin(coin_func):
+    r"""
+    Cache the coins generated by ``coin_func``.
+
+    Coins only depend on the dimension.
+    The cached arrays are shared, hence they are read-only.
+    """
+    @lru_cache(maxsize=32)
+    def cached_coin_func(dim):
+        coin = coin_func(dim)
+        coin.flags.writeable = False
+        return coin
+
+    @wraps(coin_func)
+    def wrapper(dim):
+        # degrees may be numpy integers, which do not share
+        # the cache entries of the respective int
+        return cached_coin_func(int(dim))
+
+    return wrapper
+
 class Coined(QuantumWalk):
     r"""
     Manage instances of coined quantum walks on arbitrary graphs.
@@ -181,9 +204,17 @@ class Coined(QuantumWalk):
         self.hilb_dim = self._graph.number_of_arcs()
 
         # Specific coined quantum walk attributes
+        # name of the built-in shift, None if the shift is explicit
+        self._shift_name = None
         self._shift = None
+        # S[i, perm[i]] == 1 if the shift is a permutation matrix
+        self._shift_perm = None
+        # (data, indptr) shared by the built-in shifts
+        self._shift_ones = None
         self._coin = None
         self._oracle_coin = []
+        # (coin, oracle coin, explicit coin) of the last get_coin call
+        self._coin_matrix = None
 
         # create static dicts
         if not bool(Coined._valid_kwargs):
@@ -220,29 +251,40 @@ class Coined(QuantumWalk):
         The operator is configured for future use. If an evolution
         operator was set earlier, it will be unset to maintain coherence.
         """
-        g = self._graph
-        num_vert = g.number_of_vertices()
-        num_arcs = g.number_of_arcs()
-
-        if g.is_underlying_simple():
-            S_cols = [g.arc_number((j, i))
-                      for i in range(num_vert)
-                      for j in g.neighbors(i)]
-        else:
-            S_cols = [g.arc_number((j, i, e))
-                      for i in range(num_vert)
-                      for j in g.neighbors(i)
-                      for e in range(g.number_of_edges(j, i))]
+        # arc (tail, head) is sent to arc (head, tail)
+        S_cols = self._graph._reverse_arcs()
+        self._set_permutation_shift(S_cols)
+
+    def _set_permutation_shift(self, S_cols):
+        r"""
+        Set the shift operator with ``S[i, S_cols[i]] == 1``.
+
+        The entries and row pointers of every permutation matrix
+        on the arcs are the same.
+        Hence, they are created once and shared by all
+        the built-in shift operators of this walk.
+        """
+        num_arcs = self.hilb_dim
+
+        if self._shift_ones is None:
+            ones = np.ones(num_arcs, dtype=np.int8)
+            indptr = np.arange(num_arcs + 1, dtype=np.int32)
+            # the arrays are shared, prevent changes through get_shift
+            ones.flags.writeable = False
+            indptr.flags.writeable = False
+            self._shift_ones = (ones, indptr)
+
+        ones, indptr = self._shift_ones
 
         # Using csr_array((data, indices, indptr), shape)
         # Note that there is only one entry per row and column
         S = scipy.sparse.csr_array(
-            ( np.ones(num_arcs, dtype=np.int8),
-              S_cols, np.arange(num_arcs+1) ),
-            shape=(num_arcs, num_arcs)
+            (ones, np.array(S_cols, dtype=np.int32), indptr),
+            shape=(num_arcs, num_arcs), copy=False
         )
 
         self._shift = S
+        self._shift_perm = S.indices
 
     def has_persistent_shift(self):
         r"""
@@ -274,19 +316,8 @@ class Coined(QuantumWalk):
         If an evolution operator was set previously,
         it is unset for coherence.
         """
-        num_arcs = self._graph.number_of_arcs()
-
-        S_cols = [self._graph.previous_arc(i) for i in range(num_arcs)]
-
-        # Using csr_array((data, indices, indptr), shape)
-        # Note that there is only one entry per row and column
-        S = scipy.sparse.csr_array(
-            ( np.ones(num_arcs, dtype=np.int8),
-              S_cols, np.arange(num_arcs+1) ),
-            shape=(num_arcs, num_arcs)
-        )
-
-        self._shift = S
+        S_cols = self._graph._previous_arcs()
+        self._set_permutation_shift(S_cols)
 
     def _set_shift(self, shift='default'):
         valid_vals = ['default', 'flipflop', 'persistent', 'ff', 'p']
@@ -294,7 +325,9 @@ class Coined(QuantumWalk):
         # check if string
         try:
             shift = shift.lower()
-
+        except AttributeError:
+            pass
+        else:
             if shift not in valid_vals:
                 raise ValueError(
                     "Invalid `shift` value. Expected one of "
@@ -310,36 +343,60 @@ class Coined(QuantumWalk):
             elif shift == 'p':
                 shift = 'persistent'
 
-            if str(self._shift) != shift:
-                if shift == 'flipflop':
-                    self._set_flipflop_shift()
-                else:
-                    self._set_persistent_shift()
+            if shift == 'persistent' and not self.has_persistent_shift():
+                raise AttributeError(
+                    "The persistent shift operator is not defined "
+                    + "for this graph."
+                )
+
+            if self._shift_name != shift:
+                # the operator is built on demand by get_shift
+                self._shift_name = shift
+                self._shift = None
+                self._shift_perm = None
                 return True
 
             return False
 
-        except AttributeError:
-            pass
-
         # check if explict matrix
-        try:
-            shift[0][0] #if this works, then shift is numpy or list of list
-            # convert to sparse
+        if scipy.sparse.issparse(shift):
+            # the evolution operator is computed in the CSR format.
+            # tocsr() does not copy if shift is already CSR
+            shift = shift.tocsr()
+        else:
             shift = scipy.sparse.csr_array(shift)
-        except NotImplementedError:
-            # already sparse
-            pass
 
         if (len(shift.shape) != 2 or shift.shape[0] != shift.shape[1]):
             raise TypeError('Explicit coin is not a square matrix.')
 
         if (id(self._shift) != id(shift)):
+            self._shift_name = None
             self._shift = shift
+            self._shift_perm = Coined._permutation_indices(shift)
             return True
 
         return False
 
+    @staticmethod
+    def _permutation_indices(S):
+        r"""
+        Return ``perm`` such that ``S[i, perm[i]] == 1`` if
+        the CSR matrix ``S`` is a permutation matrix.
+        Otherwise, return ``None``.
+        """
+        n = S.shape[0]
+        if S.nnz != n or np.any(np.diff(S.indptr) != 1):
+            return None
+
+        if np.any(S.data != 1):
+            return None
+
+        # every column has exactly one entry
+        if np.any(np.bincount(S.indices, minlength=n) != 1):
+            return None
+
+        return S.indices
+
     def set_shift(self, shift='default'):
         r"""
         Set the shift operator.
@@ -469,15 +526,27 @@ class Coined(QuantumWalk):
         --------
         set_shift
         """
+        if self._shift is None:
+            if self._shift_name == 'flipflop':
+                self._set_flipflop_shift()
+            else:
+                self._set_persistent_shift()
+
         return self._shift
 
+    def _shift_kwarg(self):
+        # argument that keeps the current shift in set_evolution
+        return self._shift if self._shift_name is None else self._shift_name
+
     def _set_coin(self, coin='default'):
         try:
             if len(coin.shape) != 2:
                 raise TypeError('Explicit coin is not a matrix.')
 
             # explicit coin
-            if not scipy.sparse.issparse(coin):
+            if scipy.sparse.issparse(coin):
+                coin = coin.tocsr()
+            else:
                 coin = scipy.sparse.csr_array(coin)
 
             self._coin = coin
@@ -490,8 +559,26 @@ class Coined(QuantumWalk):
         if undefined_coin:
             raise ValueError('Coin was not specified for all vertices.')
 
+        self._check_coin_list(coin_list)
         self._coin = coin_list
 
+    def _check_coin_list(self, coin_list):
+        r"""
+        Raise an exception if a coin does not exist for
+        the degree of its vertex
+        (e.g. Hadamard coin for a degree that is not a power of 2).
+
+        The coin is only built when requested,
+        but invalid coins are reported when they are set.
+        Vertices without coin (``''``) are ignored.
+        """
+        degrees = np.diff(self._graph._arcs_indptr()).tolist()
+        cache = {}
+        # the blocks are cached, hence they are created only once
+        for name, degree in set(zip(coin_list, degrees)):
+            if name != '':
+                self._coin_block(name, degree, cache)
+
     def set_coin(self, coin='default'):
         """
         Set the coin operator based on the graph's structure.
@@ -556,7 +643,7 @@ class Coined(QuantumWalk):
         as the arc :math:`(u,u)`, contributing an additional 
         one to the degree of :math:`u`.
         """
-        self.set_evolution(shift=self._shift,
+        self.set_evolution(shift=self._shift_kwarg(),
                            coin=coin,
                            marked=self._marked)
 
@@ -633,7 +720,7 @@ class Coined(QuantumWalk):
             coin_list = [self._coin_to_valid_name(coin)] * num_vert
 
         elif isinstance(coin, dict):
-            coin_list = [''] * num_vert
+            coin_list = np.full(num_vert, '', dtype=object)
             for key in coin:
                 coin_name = self._coin_to_valid_name(key)
                 value = coin[key]
@@ -642,14 +729,13 @@ class Coined(QuantumWalk):
                         raise TypeError("Expected a list of vertices. "
                                 + "Received " + str(type(value)) + " "
                                 + "with value " + str(value) + " instead.")
-                    for v in value:
-                        coin_list[self._graph.vertex_number(v)] = coin_name
+                    vertices = [self._graph.vertex_number(v) for v in value]
+                    coin_list[np.array(vertices, dtype=np.intp)] = coin_name
                 else:
-                    coin_list = [coin_name if coin_list[i] == ''
-                                 else coin_list[i]
-                                 for i in range(num_vert)]
+                    coin_list[coin_list == ''] = coin_name
 
-            undefined_coin = '' in coin_list
+            undefined_coin = bool(np.any(coin_list == ''))
+            coin_list = coin_list.tolist()
         else:
             #list of coins
             if len(coin) != num_vert:
@@ -662,20 +748,27 @@ class Coined(QuantumWalk):
         return coin_list, undefined_coin
 
     @staticmethod
+    @_cached_coin
     def _fourier_coin(dim):
         return dft(dim, scale='sqrtn')
 
     @staticmethod
+    @_cached_coin
     def _grover_coin(dim):
+        if dim == 0:
+            # empty block of a vertex without neighbors
+            return np.identity(0)
         return np.array(2/dim * np.ones((dim, dim)) - np.identity(dim))
 
     @staticmethod
+    @_cached_coin
     def _hadamard_coin(dim):
         return hadamard(dim) / np.sqrt(dim)
 
     @staticmethod
+    @_cached_coin
     def _identity_coin(dim):
-        return scipy.sparse.eye(dim)
+        return np.identity(dim)
 
     @staticmethod
     def _minus_fourier_coin(dim):
@@ -691,7 +784,7 @@ class Coined(QuantumWalk):
 
     @staticmethod
     def _minus_identity_coin(dim):
-        return -np.identity(dim)
+        return -Coined._identity_coin(dim)
 
     def _set_marked(self, marked=[]):
         try:
@@ -704,6 +797,7 @@ class Coined(QuantumWalk):
                 marked = {}
 
         coin_list, _ = self._coin_to_list(marked)
+        self._check_coin_list(coin_list)
 
         dict_values = marked.values()
         vertices = [vlist if hasattr(vlist, '__iter__') else [vlist]
@@ -747,17 +841,110 @@ class Coined(QuantumWalk):
         set_coin
         set_evolution
         """
-        self.set_evolution(shift=self._shift,
+        self.set_evolution(shift=self._shift_kwarg(),
                            coin=self._coin,
                            marked=marked)
 
-    def _coin_list_to_explicit_coin(self, coin_list):
+    def _coin_block(self, coin_name, dim, cache):
+        r"""
+        Return the ``dim``-dimensional block of the given coin.
+
+        Vertices with the same coin and degree share the same block,
+        which is created only once and stored in ``cache``.
+        """
+        key = (coin_name, dim)
+        block = cache.get(key)
+        if block is None:
+            block = Coined._coin_funcs[coin_name](dim)
+            cache[key] = block
+        return block
+
+    @staticmethod
+    def _block_diag(blocks):
+        r"""
+        Create the block diagonal CSR matrix of the given square blocks.
+
+        Equivalent to ``scipy.sparse.block_diag(blocks, format='csr')``,
+        but the CSR arrays are assembled directly.
+        If ``blocks`` is a 3-dimensional array,
+        ``blocks[v]`` is the ``v``-th block and
+        all blocks have the same dimension.
+        """
+        if isinstance(blocks, np.ndarray) and blocks.ndim == 3:
+            num_blocks, deg, _ = blocks.shape
+            dim = num_blocks*deg
+
+            # every row has ``deg`` entries
+            indptr = np.arange(0, dim*deg + 1, deg, dtype=np.int64)
+            data = blocks.reshape(-1)
+            if not data.flags.writeable:
+                # a view of a read-only (e.g. broadcast) block,
+                # the CSR array must own writable data
+                data = data.copy()
+            indices = (np.tile(np.arange(deg, dtype=np.int64), dim)
+                       + np.repeat(np.arange(0, dim, deg, dtype=np.int64),
+                                   deg*deg))
+
+        else:
+            blocks = [b.toarray() if scipy.sparse.issparse(b)
+                      else np.asarray(b)
+                      for b in blocks]
+            degrees = np.array([b.shape[0] for b in blocks], dtype=np.int64)
+            dim = np.sum(degrees)
+
+            # first row (and column) of every block
+            offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+            np.cumsum(degrees, out=offsets[1:])
+            # every row of a block has ``degree`` entries
+            row_len = np.repeat(degrees, degrees)
+            indptr = np.zeros(dim + 1, dtype=np.int64)
+            np.cumsum(row_len, out=indptr[1:])
+
+            # blocks are stored in row-major order
+            data = np.concatenate([b.ravel() for b in blocks])
+            indices = (np.repeat(np.repeat(offsets[:-1], degrees), row_len)
+                       + np.arange(indptr[-1])
+                       - np.repeat(indptr[:-1], row_len))
+
+        if indptr[-1] <= np.iinfo(np.int32).max:
+            indices = indices.astype(np.int32)
+            indptr = indptr.astype(np.int32)
+
+        C = scipy.sparse.csr_array((data, indices, indptr),
+                                   shape=(dim, dim), copy=False)
+        # zero entries of the blocks (e.g. Grover coin for degree 2)
+        # are not stored
+        C.eliminate_zeros()
+        return C
+
+    def _coin_list_blocks(self, coin_list):
+        r"""
+        Return the blocks of the coin described by ``coin_list``.
+
+        If the graph is regular, the blocks are returned as a
+        3-dimensional array where ``blocks[v]`` is the block
+        of the ``v``-th vertex.
+        Otherwise, a list of blocks is returned.
+        """
         num_vert = self._graph.number_of_vertices()
-        degree = self._graph.degree
-        blocks = [self._coin_funcs[coin_list[v]](degree(v))
-                  for v in range(num_vert)]
-        C = scipy.sparse.block_diag(blocks, format='csr')
-        return scipy.sparse.csr_array(C)
+        degrees = np.diff(self._graph._arcs_indptr())
+        cache = {}
+
+        if num_vert > 0 and np.all(degrees == degrees[0]):
+            # regular graph: all blocks are stored in a single 3D array
+            deg = int(degrees[0])
+            if coin_list.count(coin_list[0]) == num_vert:
+                block = self._coin_block(coin_list[0], deg, cache)
+                return np.broadcast_to(block, (num_vert, deg, deg))
+
+            return np.stack([self._coin_block(name, deg, cache)
+                             for name in coin_list])
+
+        return [self._coin_block(coin_list[v], degrees[v], cache)
+                for v in range(num_vert)]
+
+    def _coin_list_to_explicit_coin(self, coin_list):
+        return Coined._block_diag(self._coin_list_blocks(coin_list))
 
     def get_coin(self):
         r"""
@@ -771,6 +958,26 @@ class Coined(QuantumWalk):
         --------
         set_coin
         """
+        # The explicit coin is only rebuilt if the coin or
+        # the oracle coin changed since the last call.
+        coin_key = (self._coin if scipy.sparse.issparse(self._coin)
+                    else tuple(self._coin))
+        oracle_key = tuple(self._oracle_coin)
+
+        if self._coin_matrix is not None:
+            cached_coin, cached_oracle, C = self._coin_matrix
+            same_coin = (cached_coin is coin_key
+                         or (isinstance(cached_coin, tuple)
+                             and isinstance(coin_key, tuple)
+                             and cached_coin == coin_key))
+            if same_coin and cached_oracle == oracle_key:
+                return C
+
+        C = self._explicit_coin()
+        self._coin_matrix = (coin_key, oracle_key, C)
+        return C
+
+    def _explicit_coin(self):
         if scipy.sparse.issparse(self._coin):
             if len(self._marked) == 0:
                 return self._coin
@@ -789,33 +996,55 @@ class Coined(QuantumWalk):
                 start = min(a1, a2)
                 end = max(a1, a2) + 1
 
-                return scipy.sparse.csr_array(self._coin[start:end,
-                                                         start:end])
+                # slicing a CSR array already returns a CSR array
+                return self._coin[start:end, start:end]
 
             num_vert = self._graph.number_of_vertices()
             degree = self._graph.degree
             oracle_coin = self._oracle_coin
-            coin_funcs = Coined._coin_funcs
-            blocks = [coin_funcs[oracle_coin[v]](degree(v))
+            cache = {}
+            blocks = [self._coin_block(oracle_coin[v], degree(v), cache)
                       if oracle_coin[v] != ''
                       else get_block(v)
                       for v in range(num_vert)]
-            C = scipy.sparse.block_diag(blocks, format='csr')
+            return Coined._block_diag(blocks)
 
-            return scipy.sparse.csr_array(C)
+        return self._coin_list_to_explicit_coin(self._coin_names())
 
+    def _coin_names(self):
+        # coin name of every vertex,
+        # taking the marked vertices into account
         oracle_coin = self._oracle_coin
-        if len(oracle_coin) > 0:
-            coin = self._coin
-            coin_list = [oracle_coin[i] if oracle_coin[i] != ''
-                         else coin[i]
-                         for i in range(len(coin))]
-        else:
-            coin_list = self._coin
+        if len(oracle_coin) == 0:
+            return self._coin
 
-        return self._coin_list_to_explicit_coin(coin_list)
+        coin = self._coin
+        return [oracle_coin[i] if oracle_coin[i] != ''
+                else coin[i]
+                for i in range(len(coin))]
 
     def _set_evolution(self):
+        # the evolution operator is built on demand by get_evolution
+        self._evolution = None
+
+    def get_evolution(self):
+        r"""
+        Retrieve the evolution operator.
+
+        The evolution operator is built on the first call after
+        the shift, coin, or marked vertices are changed.
+
+        Returns
+        -------
+        :class:`scipy.sparse.csr_array`
+
+        See Also
+        --------
+        set_evolution
+        """
+        if self._evolution is not None:
+            return self._evolution
+
         # TODO: Check if matrix is sparse in pynelibna interface
         # TODO: Check if matrices are deleted from memory and GPU.
         U = None
@@ -823,30 +1052,189 @@ class Coined(QuantumWalk):
         S = self.get_shift()
         C = self.get_coin()
 
-        if nbl.get_hpc() is not None:
-            from warnings import warn
-            warn('HPC sparse matrix multiplication is not implemented. '
-                 + 'Using standard scipy multiplication instead.')
-            # # TODO: implement sparse matrix multiplication with hpc
-            # S = S.todense()
-            # C = C.todense()
+        if self._shift_perm is not None:
+            # S is a permutation matrix,
+            # hence S @ C is a permutation of the rows of C
+            U = C[self._shift_perm]
+        else:
+            if nbl.get_hpc() is not None:
+                from warnings import warn
+                warn('HPC sparse matrix multiplication is not implemented. '
+                     + 'Using standard scipy multiplication instead.')
+            U = S @ C
+
+        self._evolution = U
+        return U
+
+    def _evolution_blocks(self, dtype):
+        # U = S @ C, where S is a permutation matrix and
+        # C is block diagonal if the graph is regular.
+        self.get_shift()
+        perm = self._shift_perm
+        if perm is None or scipy.sparse.issparse(self._coin):
+            return None
+
+        degrees = np.diff(self._graph._arcs_indptr())
+        if len(degrees) == 0 or np.any(degrees != degrees[0]):
+            return None
+
+        deg = int(degrees[0])
+        # For small degrees, the matrix product of the blocks
+        # followed by the permutation is not faster than
+        # the CSR multiplication.
+        if deg <= 4:
+            return None
+
+        coin_list = self._coin_names()
+        coin_names = set(coin_list)
+        main_name = max(coin_names, key=coin_list.count)
+
+        cache = {}
+        names = [main_name] + [name for name in coin_names
+                               if name != main_name]
+        blocks = [self._coin_block(name, deg, cache) for name in names]
+        # e.g. the Fourier coin cannot be applied to real states,
+        # its imaginary part would be discarded
+        # (precision may be reduced, though)
+        if not all(np.can_cast(block.dtype, dtype, casting='same_kind')
+                   for block in blocks):
+            return None
+
+        block_T = [np.ascontiguousarray(block.T, dtype=dtype)
+                   for block in blocks]
+
+        # the most common block is applied to all vertices,
+        # the other vertices (e.g. marked vertices) are overwritten
+        others = []
+        if len(names) > 1:
+            coin_array = np.array(coin_list, dtype=object)
+            others = [(np.flatnonzero(coin_array == name), block)
+                      for name, block in zip(names[1:], block_T[1:])]
+
+        return block_T[0], others, perm
+
+    def get_evolution_operator(self):
+        r"""
+        Retrieve the evolution operator as a linear operator.
+
+        The returned operator computes :math:`U\ket\psi`
+        without creating the matrix :math:`U`.
+        This is useful when only the action of the evolution operator
+        on states is needed, e.g. with :mod:`scipy.sparse.linalg`.
 
-            # nbl_S = nbl.send_matrix(S)
-            # del S
-            # nbl_C = nbl.send_matrix(C)
-            # del C
-            # nbl_C = nbl.multiply_matrices(nbl_S, nbl_C)
+        Returns
+        -------
+        :class:`scipy.sparse.linalg.LinearOperator`
 
-            # del nbl_S
+        See Also
+        --------
+        get_evolution
+        set_evolution
 
-            # U = nbl.retrieve_matrix(nbl_C)
-            # del nbl_C
-            # U = scipy.sparse.csr_array(U)
+        Notes
+        -----
+        If the shift is the flipflop or the persistent shift and
+        the coin is given by coin names,
+        the coin is applied block by block and
+        the result is permuted according to the shift.
+        If the graph is regular, all blocks are applied at once and
+        the Fourier coin is applied with the fast Fourier transform,
+        i.e. in :math:`O(d \log d)` operations per vertex instead of
+        :math:`O(d^2)`, where :math:`d` is the degree.
+        In any other case,
+        the operator wraps the matrix returned by :meth:`get_evolution`.
 
-        U = S @ C
+        Examples
+        --------
+        .. testsetup::
 
-        self._evolution = U
-        return U
+            import numpy as np
+            import hiperwalk as hpw
+
+        .. doctest::
+
+            >>> qw = hpw.Coined(hpw.Cycle(5), coin='hadamard')
+            >>> U = qw.get_evolution_operator()
+            >>> psi = qw.ket(0)
+            >>> np.allclose(U @ psi, qw.get_evolution() @ psi)
+            True
+        """
+        if self._evolution is not None:
+            return scipy.sparse.linalg.aslinearoperator(self._evolution)
+
+        self.get_shift()
+        perm = self._shift_perm
+        if perm is None or scipy.sparse.issparse(self._coin):
+            return scipy.sparse.linalg.aslinearoperator(
+                self.get_evolution())
+
+        N = self.hilb_dim
+        coin_list = self._coin_names()
+        degrees = np.diff(self._graph._arcs_indptr())
+
+        if len(degrees) > 0 and np.all(degrees == degrees[0]):
+            num_vert = len(degrees)
+            deg = int(degrees[0])
+
+            # the Fourier coin is applied with the FFT,
+            # the other coins are dense blocks
+            names = np.array(coin_list, dtype=object)
+            fourier = (names == 'fourier') | (names == 'minus_fourier')
+            fft_vert = np.flatnonzero(fourier)
+            fft_sign = np.where(names[fft_vert] == 'minus_fourier',
+                                -1, 1)[:, None]
+            block_vert = np.flatnonzero(~fourier)
+
+            block_names = names[block_vert].tolist()
+            cache = {}
+            # transpose of the block shared by all vertices, if any
+            block_T = None
+            if (len(block_names) > 0
+                    and block_names.count(block_names[0]) == len(block_names)):
+                block = self._coin_block(block_names[0], deg, cache)
+                block_T = block.T
+                blocks = np.broadcast_to(block,
+                                         (len(block_names), deg, deg))
+            elif len(block_names) > 0:
+                blocks = np.stack([self._coin_block(name, deg, cache)
+                                   for name in block_names])
+            else:
+                blocks = np.empty((0, deg, deg))
+
+            dtype = (np.result_type(blocks.dtype, complex)
+                     if len(fft_vert) > 0 else blocks.dtype)
+
+            def matvec(psi):
+                psi = psi.reshape(num_vert, deg)
+                C_psi = np.empty(psi.shape,
+                                 dtype=np.result_type(dtype, psi.dtype))
+                if len(fft_vert) == num_vert:
+                    C_psi[:] = np.fft.fft(psi, axis=1, norm='ortho')
+                    C_psi *= fft_sign
+                elif len(fft_vert) > 0:
+                    C_psi[fft_vert] = fft_sign*np.fft.fft(psi[fft_vert],
+                                                          axis=1,
+                                                          norm='ortho')
+                if block_T is not None and len(block_vert) == num_vert:
+                    # a single matrix product
+                    np.matmul(psi, block_T, out=C_psi)
+                elif block_T is not None:
+                    C_psi[block_vert] = psi[block_vert] @ block_T
+                elif len(block_vert) > 0:
+                    C_psi[block_vert] = np.einsum('vij,vj->vi', blocks,
+                                                  psi[block_vert])
+                # S @ (C @ psi)
+                return C_psi.reshape(-1)[perm]
+
+        else:
+            C = self.get_coin()
+            dtype = C.dtype
+
+            def matvec(psi):
+                return (C @ psi.reshape(-1))[perm]
+
+        return scipy.sparse.linalg.LinearOperator((N, N), matvec=matvec,
+                                                  dtype=dtype)
 
     def set_evolution(self, **kwargs):
         """
@@ -859,6 +1247,8 @@ class Coined(QuantumWalk):
 
         Subsequently, the evolution operator is constructed by 
         multiplying the shift and coin operators. 
+        The operators are only built when they are first requested
+        (e.g. by :meth:`get_evolution` or :meth:`simulate`).
         If the coin operator is given as an explicit matrix, 
         its definition remains unaltered 
         even in the presence of marked vertices. However, if the coin 
@@ -900,13 +1290,10 @@ class Coined(QuantumWalk):
         vertex will be substituted based on the most recent 
         :meth:`set_marked` invocation.
 
-
-        .. warning::
-            Sparse matrix multipliation is not supported yet.
-            Converting all matrices to dense.
-            Then converting back to sparse.
-            This uses unnecessary memory and computational time.
-
+        If the shift is the flipflop or the persistent shift,
+        or an explicit permutation matrix,
+        :math:`U` is obtained by permuting the rows of :math:`C`,
+        without matrix multiplication.
 
         References
         ----------
@@ -985,18 +1372,25 @@ class Coined(QuantumWalk):
         try:
             states.shape == 1
         except:
-            states = np.array(states, copy=False)
+            states = np.asarray(states)
 
         if len(states.shape) == 1:
-            states = np.array([states], copy=False)
+            states = np.asarray([states])
+
+        # arcs are grouped by tail,
+        # the arcs with tail v are indptr[v], ..., indptr[v + 1] - 1
+        indptr = self._graph._arcs_indptr()
+        num_vert = len(indptr) - 1
+        arcs_prob = Coined._elementwise_probability(states)
 
+        # reduceat does not handle empty intervals (vertices of degree 0)
+        nonempty = indptr[1:] > indptr[:-1]
+        if np.all(nonempty):
+            return np.add.reduceat(arcs_prob, indptr[:-1], axis=1)
 
-        graph = self._graph
-        num_vert = graph.number_of_vertices()
-        prob = np.array([[Coined._elementwise_probability(
-                              states[i, graph.arcs_with_tail(v)]).sum()
-                          for v in range(num_vert)]
-                         for i in range(len(states))])
+        prob = np.zeros((len(states), num_vert), dtype=arcs_prob.dtype)
+        prob[:, nonempty] = np.add.reduceat(arcs_prob,
+                                            indptr[:-1][nonempty], axis=1)
 
         return prob
 
@@ -1065,13 +1459,19 @@ class Coined(QuantumWalk):
         if len(entries) == 0:
             raise TypeError("Entries were not specified.")
 
-        dtype = np.array([entry[0] for entry in entries]).dtype
-        dtype = (complex if np.issubdtype(dtype, np.complexfloating)
-                 else float)
+        # stops at the first complex amplitude
+        has_complex = any(isinstance(entry[0], (complex, np.complexfloating))
+                          for entry in entries)
+        dtype = complex if has_complex else float
         state = np.zeros(self.hilb_dim, dtype=dtype)
 
-        for ampl, arc in entries:
-            state[self._graph.arc_number(arc)] = ampl
+        labels = np.array([self._graph.arc_number(entry[1])
+                           for entry in entries])
+        ampls = np.array([entry[0] for entry in entries], dtype=dtype)
+        # if a label is repeated, the last entry is used
+        _, last = np.unique(labels[::-1], return_index=True)
+        last = len(labels) - 1 - last
+        state[labels[last]] = ampls[last]
 
         return self._normalize(state)
 
@@ -1149,8 +1549,11 @@ class Coined(QuantumWalk):
 
         # uniform superposition of the given vertices
         if vertices is not None:
-            for v in vertices:
-                state[self._graph.arcs_with_tail(v)] = 1
+            tails = np.zeros(self._graph.number_of_vertices(), dtype=bool)
+            tails[[self._graph.vertex_number(v) for v in vertices]] = True
+            # arcs are grouped by tail
+            indptr = self._graph._arcs_indptr()
+            state[np.repeat(tails, np.diff(indptr))] = 1
 
         return state / np.sqrt(np.sum(state))
 
@@ -1,6 +1,7 @@
 import numpy as np
 import scipy.sparse
 import scipy.linalg
+import scipy.special
 from .quantum_walk import QuantumWalk
 from . import _pyneblina_interface as nbl
 
@@ -541,3 +542,122 @@ class ContinuousTime(QuantumWalk):
         update = filter_and_call(self._set_terms, update)
         if (update):
             filter_and_call(self._set_evolution, update)
+
+    def simulate_chebyshev(self, time=None, state=None, tol=1e-13):
+        r"""
+        Compute the state of the walk at the given time.
+
+        The state :math:`\text{e}^{-\text{i}tH}\ket{\psi}` is computed
+        with a Chebyshev expansion that only multiplies
+        the sparse Hamiltonian by vectors.
+        Hence, the evolution operator is not created.
+
+        Parameters
+        ----------
+        time : float, default=None
+            Time :math:`t` of the walk.
+            If ``None``, the time of the evolution operator is used.
+            See :meth:`set_time`.
+
+        state : :class:`numpy.ndarray`, default=None
+            The initial state :math:`\ket{\psi}`.
+
+        tol : float, default=1e-13
+            The expansion stops when its coefficients are
+            smaller than ``tol``.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The state at time ``time``.
+
+        Raises
+        ------
+        ValueError
+            If ``state is None``.
+
+        See Also
+        --------
+        simulate
+        get_hamiltonian
+
+        Notes
+        -----
+        Let the spectrum of :math:`H` be contained in
+        :math:`[b - a, b + a]`, and :math:`\tilde H = (H - bI)/a`.
+        Then
+
+        .. math::
+            \text{e}^{-\text{i}tH} = \text{e}^{-\text{i}tb}
+            \left(J_0(at) + 2\sum_{k=1}^{\infty}
+            (-\text{i})^k J_k(at) T_k(\tilde H)\right),
+
+        where :math:`J_k` are Bessel functions of the first kind and
+        :math:`T_k` are Chebyshev polynomials, which satisfy
+        :math:`T_{k+1}(\tilde H) = 2\tilde H T_k(\tilde H)
+        - T_{k - 1}(\tilde H)`.
+        The bounds :math:`b \pm a` are obtained
+        with the Gershgorin circle theorem.
+        As :math:`J_k(at)` vanishes quickly for :math:`k > at`,
+        about :math:`at` multiplications by :math:`H` are required,
+        for any ``time``.
+
+        Examples
+        --------
+        .. testsetup::
+
+            import numpy as np
+            import hiperwalk as hpw
+
+        .. doctest::
+
+            >>> qw = hpw.ContinuousTime(hpw.Cycle(10), gamma=0.35, time=2)
+            >>> psi = qw.simulate_chebyshev(state=qw.ket(0))
+            >>> np.allclose(psi, qw.get_evolution() @ qw.ket(0))
+            True
+        """
+        if state is None:
+            raise ValueError(
+                "``state`` not specified. "
+                + "Expected a np.array."
+            )
+
+        if time is None:
+            time = self._time
+
+        H = scipy.sparse.csr_array(self.get_hamiltonian())
+        state = np.asarray(state, dtype=complex)
+
+        # Gershgorin bounds of the spectrum
+        diag = H.diagonal().real
+        radius = np.abs(H).sum(axis=1) - np.abs(diag)
+        lower = np.min(diag - radius)
+        upper = np.max(diag + radius)
+        center = (upper + lower) / 2
+        # nonzero half width, even if H is a multiple of I
+        half_width = max((upper - lower) / 2, np.finfo(float).eps)
+
+        def scaled_H(v):
+            return (H @ v - center*v) / half_width
+
+        x = half_width*time
+        prev = state
+        curr = scaled_H(state)
+        res = scipy.special.jv(0, x)*prev - 2j*scipy.special.jv(1, x)*curr
+
+        k = 1
+        phase = -1j
+        while True:
+            k += 1
+            coeff = scipy.special.jv(k, x)
+            next_ = 2*scaled_H(curr) - prev
+            phase *= -1j
+            res += 2*phase*coeff*next_
+            prev, curr = curr, next_
+
+            # the coefficients decrease monotonically for k > |x|
+            # (x is negative for negative times)
+            if k > abs(x) and abs(coeff) < tol:
+                break
+
+        return np.exp(-1j*time*center)*res
@@ -7,6 +7,14 @@ from warnings import warn
 from ..graph import Graph
 import scipy.optimize
 from . import _pyneblina_interface as nbl
+try:
+    # CSR kernels of scipy's matrix-vector and matrix-matrix products.
+    # Unlike ``A @ v``, they write to a given array (``y += A @ v``).
+    from scipy.sparse._sparsetools import csr_matvec as _csr_matvec
+    from scipy.sparse._sparsetools import csr_matvecs as _csr_matvecs
+except ImportError:
+    _csr_matvec = None
+    _csr_matvecs = None
 
 class QuantumWalk(ABC):
     """
@@ -39,6 +47,25 @@ class QuantumWalk(ABC):
         # Vector object used during simulation.
         # Should be different from None during simulation only.
         self._simul_vec = None
+        # powers of the simulation matrix used during simulation,
+        # indexed by the exponent (None if not worth computing)
+        self._simul_pow = None
+        # Spare vector that alternates with ``_simul_vec``
+        # during simulation.
+        self._simul_buf = None
+        # Evolution operator applied by blocks during simulation
+        # (see _evolution_blocks), or None.
+        self._simul_blocks = None
+        # Number of applications between renormalizations
+        # (None if the state is not renormalized).
+        self._simul_renorm = None
+        self._simul_count = 0
+        # Object identifying the running simulation (see _simulate_states).
+        self._simul_id = None
+        # (evolution, engine id, neblina matrix) of the last
+        # evolution operator sent to the HPC engine.
+        # It is reused while the evolution operator does not change.
+        self._hpc_evolution = None
 
         self._graph = graph
         self.hilb_dim = 0
@@ -171,6 +198,9 @@ class QuantumWalk(ABC):
         # This is more efficient than:
         # (np.conj(elem) * elem).real
         # elem.real**2 + elem.imag**2
+        if not np.iscomplexobj(elem):
+            # elem.imag would allocate an array of zeros
+            return elem*elem
         return elem.real*elem.real + elem.imag*elem.imag
 
     def success_probability(self, states):
@@ -211,7 +241,7 @@ class QuantumWalk(ABC):
         try:
             states.shape == 1
         except TypeError:
-            states = np.array(states, copy=False)
+            states = np.asarray(states)
 
         if states.shape == 1:
             return np.zeros(size)
@@ -256,13 +286,12 @@ class QuantumWalk(ABC):
             len(states[0])
         except TypeError:
             single_state = True
-            states = np.array([states], copy=False)
+            states = np.asarray([states])
 
         probs = self.probability_distribution(states)
-        probs = np.array([
-                    np.sum(probs[i, vertices])
-                    for i in range(len(states))
-                    ])
+        # one fancy indexing for all states
+        probs = probs[:, vertices].reshape(len(probs), -1)
+        probs = np.sum(probs, axis=1)
 
         return probs[0] if single_state else probs
 
@@ -317,8 +346,7 @@ class QuantumWalk(ABC):
             single_state = True
             states = np.array([states])
 
-        prob = list(map(QuantumWalk._elementwise_probability, states))
-        prob = np.array(prob)
+        prob = QuantumWalk._elementwise_probability(np.asarray(states))
 
         return prob[0] if single_state else prob
 
@@ -425,13 +453,19 @@ class QuantumWalk(ABC):
         if len(entries) == 0:
             raise TypeError("Entries were not specified.")
 
-        dtype = np.array([entry[0] for entry in entries]).dtype
-        dtype = (complex if np.issubdtype(dtype, np.complexfloating)
-                 else float)
+        # stops at the first complex amplitude
+        has_complex = any(isinstance(entry[0], (complex, np.complexfloating))
+                          for entry in entries)
+        dtype = complex if has_complex else float
         state = np.zeros(self.hilb_dim, dtype=dtype)
 
-        for ampl, vertex in entries:
-            state[self._graph.vertex_number(vertex)] = ampl
+        labels = np.array([self._graph.vertex_number(entry[1])
+                           for entry in entries])
+        ampls = np.array([entry[0] for entry in entries], dtype=dtype)
+        # if a label is repeated, the last entry is used
+        _, last = np.unique(labels[::-1], return_index=True)
+        last = len(labels) - 1 - last
+        state[labels[last]] = ampls[last]
 
         return self._normalize(state)
 
@@ -452,15 +486,52 @@ class QuantumWalk(ABC):
     ### Auxiliary Simulation functions ###
     ######################################
 
-    def _prepare_engine(self, state, hpc):
+    def _prepare_engine(self, evolution, state, hpc):
+        self._simul_pow = None
+        self._simul_buf = None
+        self._simul_blocks = None
 
         if hpc is not None:
-            self._simul_mat = nbl.send_matrix(self._evolution)
-            self._simul_vec = nbl.send_vector(state)
+            self._simul_mat = self._send_evolution(evolution)
+            if (np.iscomplexobj(state)
+                    and not np.iscomplexobj(evolution)):
+                # The real matrix is applied to the real and
+                # imaginary parts, which are sent as real vectors.
+                self._simul_vec = (nbl.send_vector(state.real.copy()),
+                                   nbl.send_vector(state.imag.copy()))
+            else:
+                self._simul_vec = nbl.send_vector(state)
 
         else:
-            self._simul_mat = self._evolution
-            self._simul_vec = state
+            self._simul_mat = evolution
+            self._simul_blocks = self._evolution_blocks(state.dtype)
+            if (self._simul_blocks is None
+                    and np.iscomplexobj(state)
+                    and not np.iscomplexobj(evolution)):
+                # The real matrix is applied to the real and
+                # imaginary parts, which are the columns of a real matrix.
+                # This avoids a complex copy of the evolution operator
+                # and complex multiplications.
+                self._simul_vec = np.column_stack((state.real, state.imag))
+            else:
+                self._simul_vec = state
+
+    def _send_evolution(self, evolution):
+        r"""
+        Send the evolution operator to the HPC engine.
+
+        The matrix is only sent if it is not the one
+        sent by the previous simulation.
+        """
+        engine_id = nbl.engine_id()
+        if self._hpc_evolution is not None:
+            sent, sent_engine_id, nbl_mat = self._hpc_evolution
+            if sent is evolution and sent_engine_id == engine_id:
+                return nbl_mat
+
+        nbl_mat = nbl.send_matrix(evolution)
+        self._hpc_evolution = (evolution, engine_id, nbl_mat)
+        return nbl_mat
 
     def _simulate_step(self, step, hpc):
         """
@@ -468,33 +539,230 @@ class QuantumWalk(ABC):
         to the simulation vector.
         Simulation vector is then updated.
         """
+        renorm = self._simul_renorm
+        if renorm is None:
+            self._multiply_simul_vec(step, hpc)
+            return
+
+        while step > 0:
+            num_mult = min(step, renorm - self._simul_count)
+            self._multiply_simul_vec(num_mult, hpc)
+            step -= num_mult
+            self._simul_count += num_mult
+
+            if self._simul_count == renorm:
+                # at least one multiplication was done,
+                # so the vector is not the initial state
+                self._simul_vec /= np.linalg.norm(self._simul_vec)
+                self._simul_count = 0
+
+    def _multiply_simul_vec(self, step, hpc):
+        """
+        Multiply the simulation vector by
+        the simulation matrix ``step`` times.
+        """
         if hpc is not None:
-            # TODO: request multiple multiplications at once
-            #       to neblina-core
             # TODO: check if intermediate states are being freed
             is_sparse = scipy.sparse.issparse(self._evolution)
-            for i in range(step):
-                self._simul_vec = nbl.multiply_matrix_vector(
-                    self._simul_mat, self._simul_vec, is_sparse)
+            if isinstance(self._simul_vec, tuple):
+                # real and imaginary parts stored separately
+                self._simul_vec = tuple(
+                    nbl.multiply_matrix_vector_n(
+                        self._simul_mat, vec, is_sparse, step)
+                    for vec in self._simul_vec)
+            else:
+                self._simul_vec = nbl.multiply_matrix_vector_n(
+                    self._simul_mat, self._simul_vec, is_sparse, step)
         else:
+            mat_pow = self._simul_matrix_power(step)
+            if mat_pow is not None:
+                self._simul_vec = mat_pow @ self._simul_vec
+                return
+
+            if self._simul_blocks is not None:
+                self._simulate_block_step(step)
+                return
+
+            U = self._simul_mat
+            vec = self._simul_vec
+            if isinstance(U, np.ndarray) and U.dtype == vec.dtype:
+                self._simulate_buffered_step(step)
+                return
+
+            if (_csr_matvec is not None
+                    and scipy.sparse.issparse(U)
+                    and U.format == 'csr'
+                    and U.dtype == vec.dtype):
+                self._simulate_buffered_step(step)
+                return
+
             for i in range(step):
                 self._simul_vec = self._simul_mat @ self._simul_vec
 
-            # TODO: compare with numpy.linalg.matrix_power
+    def _simulate_buffered_step(self, step):
+        r"""
+        Apply the simulation matrix ``step`` times
+        alternating between two preallocated vectors.
+
+        The simulation matrix is either a dense matrix or
+        a CSR matrix (if ``_csr_matvec`` is available).
+        The simulation vector may have two columns
+        (real and imaginary parts).
+        """
+        U = self._simul_mat
+
+        if self._simul_buf is None:
+            # ``_simul_vec`` may be the initial state given by the user,
+            # hence it is not overwritten
+            self._simul_vec = U @ self._simul_vec
+            self._simul_buf = np.empty_like(self._simul_vec)
+            step -= 1
+
+        vec = self._simul_vec
+        buf = self._simul_buf
+        if scipy.sparse.issparse(U) and vec.ndim == 2:
+            num_rows, num_cols = U.shape
+            num_vecs = vec.shape[1]
+            # the kernels expect flattened C-contiguous arrays,
+            # ravel returns views of vec and buf
+            for i in range(step):
+                buf.fill(0)
+                _csr_matvecs(num_rows, num_cols, num_vecs,
+                             U.indptr, U.indices, U.data,
+                             vec.ravel(), buf.ravel())
+                vec, buf = buf, vec
+        elif scipy.sparse.issparse(U):
+            num_rows, num_cols = U.shape
+            for i in range(step):
+                buf.fill(0)
+                _csr_matvec(num_rows, num_cols,
+                            U.indptr, U.indices, U.data, vec, buf)
+                vec, buf = buf, vec
+        else:
+            for i in range(step):
+                np.matmul(U, vec, out=buf)
+                vec, buf = buf, vec
+
+        self._simul_vec = vec
+        self._simul_buf = buf
+
+    def _evolution_blocks(self, dtype):
+        r"""
+        Return the evolution operator as blocks and a permutation.
+
+        Let :math:`U = PB`, where :math:`P` is a permutation matrix
+        and :math:`B` is a block diagonal matrix whose blocks
+        have the same dimension.
+        Return ``(block, others, perm)``, where
+        ``block`` is the transpose of the most common block,
+        ``others`` is a list of ``(vertices, block)`` pairs
+        with the transposes of the remaining blocks, and
+        ``U @ psi == (B @ psi)[perm]``.
+        The blocks have the given ``dtype``.
+
+        Return ``None`` if the evolution operator has no such form,
+        which is the default.
+        """
+        return None
+
+    def _simulate_block_step(self, step):
+        r"""
+        Apply the simulation matrix ``step`` times by blocks.
+
+        The blocks returned by :meth:`_evolution_blocks` are
+        applied to all vertices with a single matrix product, and
+        the permutation is applied by indexing.
+        Two preallocated vectors are used.
+        """
+        block, others, perm = self._simul_blocks
+        deg = block.shape[0]
+        vec = self._simul_vec
+        buf = self._simul_buf
+
+        if buf is None:
+            buf = np.empty_like(vec)
+
+        for i in range(step):
+            vec_blocks = vec.reshape(-1, deg)
+            buf_blocks = buf.reshape(-1, deg)
+            np.matmul(vec_blocks, block, out=buf_blocks)
+            for vertices, other in others:
+                buf_blocks[vertices] = vec_blocks[vertices] @ other
+
+            if self._simul_buf is None:
+                # ``vec`` may be the initial state given by the user,
+                # hence it is not overwritten
+                vec = np.empty_like(vec)
+                self._simul_buf = buf
+            np.take(buf, perm, out=vec)
+
+        self._simul_vec = vec
+
+    def _simul_matrix_power(self, step):
+        r"""
+        Return the ``step``-th power of the simulation matrix
+        if it is cheaper than ``step`` matrix-vector multiplications.
+        Otherwise, return ``None``.
+
+        Every power is computed at most once per simulation,
+        since every saved state but the first is ``step``
+        multiplications away from the previous one.
+        If the state is renormalized,
+        the multiplications are split into chunks of a few lengths
+        (see :meth:`_simulate_step`), whose powers are also reused.
+        """
+        if self._simul_pow is None:
+            self._simul_pow = {}
+        elif step in self._simul_pow:
+            return self._simul_pow[step]
+
+        mat_pow = None
+        U = self._simul_mat
+        dim = U.shape[0]
+        # not worth it for few multiplications, and
+        # the powers of a sparse matrix fill in,
+        # hence only nearly dense matrices are considered.
+        # Binary exponentiation requires up to 2*log2(step)
+        # matrix products of dim**3 operations each,
+        # while step matrix-vector products take step*dim**2
+        if (step >= 16
+                and (not scipy.sparse.issparse(U) or U.nnz > dim*dim / 8)
+                and 2*dim*np.log2(step) < step):
+            if scipy.sparse.issparse(U):
+                U = U.toarray()
+            mat_pow = np.linalg.matrix_power(U, step)
+
+        self._simul_pow[step] = mat_pow
+        return mat_pow
 
     def _save_simul_vec(self, hpc, continue_simulation):
         ret = None
 
         if hpc is not None:
-            ret = nbl.copy_vector(self._simul_vec)
+            if isinstance(self._simul_vec, tuple):
+                # real and imaginary parts stored separately
+                real, imag = self._simul_vec
+                ret = nbl.copy_vector(real) + 1j*nbl.copy_vector(imag)
+            else:
+                ret = nbl.copy_vector(self._simul_vec)
+        elif self._simul_vec.ndim == 2:
+            # real and imaginary parts stored separately
+            ret = np.empty(len(self._simul_vec),
+                           dtype=np.result_type(self._simul_vec.dtype,
+                                                np.complex64))
+            ret.real = self._simul_vec[:, 0]
+            ret.imag = self._simul_vec[:, 1]
         else:
-            ret = self._simul_vec.copy()
+            # Not a copy, the vector may be overwritten by the next step.
+            # The states kept by simulate are copied when saved.
+            ret = self._simul_vec
 
         return ret
 
 
 
-    def simulate(self, range=None, state=None):
+    def simulate(self, range=None, state=None, precision='double',
+                 renorm_every=None, measure=None):
         r"""
         Simulates the quantum walk.
 
@@ -540,16 +808,41 @@ class QuantumWalk(ABC):
             The starting state onto which the evolution operator
             will be applied.
 
+        precision : {'double', 'single'}, default='double'
+            Floating-point precision of the simulation.
+            If ``'single'``, the evolution operator and the states
+            are converted to single precision
+            (:obj:`numpy.float32` or :obj:`numpy.complex64`),
+            which halves the memory used by the simulation.
+            Single precision is not available with HPC.
+
+        renorm_every : int, default=None
+            If not ``None``, the state is normalized after every
+            ``renorm_every`` applications of the evolution operator,
+            which prevents the accumulation of rounding errors
+            in the norm of the state (e.g. in single precision).
+            Renormalization is not available with HPC.
+
+        measure : list of int, default=None
+            If not ``None``, the states are not kept.
+            Instead, the probability of the walker being located on
+            the vertices in ``measure`` is computed for every state
+            that would be saved (see :meth:`probability`).
+
         Returns
         -------
         states : :class:`numpy.ndarray`.
             States retained during the simulation where
             ``states[i]`` is the ``i``-th saved state.
+            If ``measure`` is not ``None``,
+            ``states[i]`` is the probability corresponding to
+            the ``i``-th saved state.
 
         Raises
         ------
         ValueError
-            Triggered if ``range is None`` or ``state is None``.
+            Triggered if ``range is None`` or ``state is None``,
+            or if ``precision`` or ``renorm_every`` is invalid.
 
         See Also
         --------
@@ -583,6 +876,55 @@ class QuantumWalk(ABC):
         Given ``range=(0, 13, 3)``, the saved states would include:
         the initial state (t=0), intermediate states (t=3, 6, and 9),
         and the concluding state (t=12).
+
+        In single precision,
+        each application of the evolution operator may change
+        the norm of the state by about ``1e-7``.
+        Hence, the rounding errors are only negligible
+        for a moderate number of applications.
+
+        If only the probability of a subset of vertices is needed,
+        ``measure`` avoids storing all the states.
+        For instance, the probabilities of the ``0``-th vertex are
+        ``qw.simulate(range, state, measure=[0])``, which equals
+        ``qw.probability(qw.simulate(range, state), [0])``.
+        """
+        if measure is not None:
+            # only the probabilities are kept,
+            # not the simulated states
+            return np.array([
+                self.probability(psi, measure)
+                for psi in self._simulate_states(range, state, precision,
+                                                   renorm_every)
+            ])
+
+        saved_states = None
+        for i, saved_state in enumerate(
+                self._simulate_states(range, state, precision, renorm_every)):
+            if saved_states is None:
+                # range is valid once the first state is yielded
+                start, end, step = QuantumWalk._range_to_tuple(range)
+                num_states = 1 + (end - 1 - start) // step
+                saved_states = np.zeros(
+                    (num_states, saved_state.shape[0]),
+                    dtype=saved_state.dtype
+                )
+            saved_states[i] = saved_state
+
+        return saved_states
+
+    def _simulate_states(self, range, state, precision='double',
+                         renorm_every=None):
+        r"""
+        Generator of the states saved by :meth:`simulate`.
+
+        The states are yielded one at a time,
+        so the caller may process each state
+        (e.g. compute its probabilities)
+        without storing all of them.
+        A yielded array must not be modified, and
+        it is only valid until the next state is requested.
+        See :meth:`simulate` for the parameters.
         """
         ############################################
         ### Check if simulation was set properly ###
@@ -599,6 +941,20 @@ class QuantumWalk(ABC):
                 + "Expected a np.array."
             )
 
+        if precision not in ('double', 'single'):
+            raise ValueError(
+                "Invalid `precision` value. Expected one of "
+                + "['double', 'single']. But received '"
+                + str(precision) + "' instead."
+            )
+
+        if renorm_every is not None and (int(renorm_every) != renorm_every
+                                         or renorm_every < 1):
+            raise ValueError(
+                "Invalid `renorm_every` value. Expected a positive int. "
+                + "But received '" + str(renorm_every) + "' instead."
+            )
+
         if len(state) != self.hilb_dim:
             raise ValueError(
                 "Initial condition has invalid dimension. "
@@ -623,49 +979,86 @@ class QuantumWalk(ABC):
         if self._evolution is None:
             self._evolution = self.get_evolution()
 
+        # CSR is the efficient format for matrix-vector multiplication.
+        # The conversion is done once, not at every step.
+        if (scipy.sparse.issparse(self._evolution)
+            and self._evolution.format != 'csr'
+        ):
+            self._evolution = self._evolution.tocsr()
+
         is_mat_complex = np.issubdtype(self._evolution.dtype,
                                        np.complexfloating)
         is_vec_complex = np.issubdtype(state.dtype,
                                        np.complexfloating)
-        if is_mat_complex != is_vec_complex:
-            if not is_mat_complex:
-                self._evolution = self._evolution.astype(complex)
+        # A real matrix is applied to the real and imaginary parts
+        # of a complex state (see _prepare_engine).
+        if is_mat_complex and not is_vec_complex:
+            state = state.astype(complex)
+
+        evolution = self._evolution
+        if precision == 'single':
+            if hpc is not None:
+                warn('Single precision is not implemented for HPC. '
+                     + 'Using double precision instead.')
             else:
-                state = state.astype(complex)
+                # the stored evolution operator is not changed
+                evolution = evolution.astype(
+                    np.complex64 if is_mat_complex else np.float32)
+                state = state.astype(
+                    np.complex64 if np.iscomplexobj(state)
+                    else np.float32)
+
+        if renorm_every is not None and hpc is not None:
+            warn('Renormalization is not implemented for HPC. '
+                 + 'The state is not renormalized.')
+            renorm_every = None
 
-        dtype = state.dtype
         #########################################################
 
-        self._prepare_engine(state, hpc)
-
-        # number of states to save
-        num_states = 1 + (end - 1 - start) // step
-
-        saved_states = np.zeros(
-            (num_states, state.shape[0]), dtype=dtype
-        )
-        state_index = 0 # index of the state to be saved
-
-        # if save_state:
-        if start == 0:
-            saved_states[0] = state.copy()
-            state_index += 1
-
-        # simulate walk / apply evolution operator
-        if start > 0:
-            self._simulate_step(start - step, hpc)
-
-        while state_index < num_states:
-            self._simulate_step(step, hpc)
-            saved_states[state_index] = self._save_simul_vec(
-                    hpc, state_index + 1 < num_states)
+        # Identifies this simulation.
+        # A generator that is closed after another simulation started
+        # (e.g. abandoned and garbage collected) does not reset
+        # the attributes of the running simulation.
+        simulation = object()
+        self._simul_id = simulation
+        try:
+            self._prepare_engine(evolution, state, hpc)
+            self._simul_renorm = renorm_every
+            # applications of the evolution operator since the last
+            # renormalization
+            self._simul_count = 0
+
+            # number of states to save
+            num_states = 1 + (end - 1 - start) // step
+            state_index = 0 # index of the state to be saved
+
+            # if save_state:
+            if start == 0:
+                # the caller copies the states it keeps
+                yield state
+            else:
+                # simulate walk / apply evolution operator
+                self._simulate_step(start, hpc)
+                yield self._save_simul_vec(hpc, num_states > 1)
             state_index += 1
 
-        # TODO: free vector from neblina core
-        self._simul_mat = None
-        self._simul_vec = None
-
-        return saved_states
+            while state_index < num_states:
+                self._simulate_step(step, hpc)
+                yield self._save_simul_vec(hpc, state_index + 1 < num_states)
+                state_index += 1
+
+        finally:
+            # The attributes are reset even if the generator is
+            # not fully consumed (or an exception is raised).
+            if self._simul_id is simulation:
+                # TODO: free vector from neblina core
+                self._simul_mat = None
+                self._simul_vec = None
+                self._simul_pow = None
+                self._simul_buf = None
+                self._simul_blocks = None
+                self._simul_renorm = None
+                self._simul_id = None
 
     @staticmethod
     def _get_valid_kwargs(method):
@@ -790,13 +1183,16 @@ class QuantumWalk(ABC):
         # if search algorithm takes O(N),
         # it is better to use classical computing.
         final_time = N//2
-        states = self.simulate(range=(0,final_time, step),
-                               state=state)
-        p_succ = self.success_probability(states)
-        del states
+        # only the success probabilities are kept,
+        # not the simulated states
+        p_succ = np.array([
+            self.success_probability(psi)
+            for psi in self._simulate_states((0, final_time, step),
+                                               state)
+        ])
 
         d = QuantumWalk.fit_sin_squared(
-                np.arange(0, final_time + step, step),
+                np.arange(0, final_time, step),
                 p_succ
             )
         t_opt = (np.pi/2 - d['phase shift']) / d['angular frequency']
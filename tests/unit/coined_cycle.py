@@ -74,6 +74,20 @@ class TestCoinedCycle(unittest.TestCase):
         self.assertTrue(np.allclose(states, rec_states,
                                     rtol=1e-15, atol=1e-15))
 
+    def test_simulate_range_start_less_than_step(self):
+        init_state = self.qw.ket(0)
+        states = self.qw.simulate((1, 10, 2), init_state)
+
+        U = self.qw.get_evolution()
+        state = init_state
+        expected = []
+        for i in range(1, 10):
+            state = U @ state
+            if i % 2 == 1:
+                expected.append(state)
+
+        self.assertTrue(np.allclose(states, expected))
+
     @unittest.skipIf(HPC is None, 'Skipping comparison tests between '
                                   'numpy and PyHiperBlas')
     def test_hpc_evolution_operator_matches_nonhpc(self):
@@ -94,3 +108,79 @@ class TestCoinedCycle(unittest.TestCase):
         self.qw.set_coin(coin=C)
         C2 = self.qw.get_coin()
         self.assertTrue((C - C2).nnz == 0)
+
+    def test_evolution_operator_matches_evolution(self):
+        self.qw.set_evolution(coin='hadamard', marked=[0])
+        state = self.qw.ket((0, 1))
+        L = self.qw.get_evolution_operator()
+        U = self.qw.get_evolution()
+        self.assertTrue(np.allclose(L @ state, U @ state))
+
+    def test_fourier_evolution_operator_matches_evolution(self):
+        self.qw.set_evolution(coin='fourier', marked=[0])
+        state = self.qw.ket((0, 1))
+        L = self.qw.get_evolution_operator()
+        U = self.qw.get_evolution()
+        self.assertTrue(np.allclose(L @ state, U @ state))
+
+    def test_simulate_single_precision(self):
+        init_state = self.qw.ket((0, 1))
+        states = self.qw.simulate((0, 10, 3), init_state)
+        single = self.qw.simulate((0, 10, 3), init_state,
+                                  precision='single')
+
+        self.assertTrue(single.dtype == np.float32)
+        self.assertTrue(np.allclose(single, states, atol=1e-6))
+
+    def test_single_vertex_graph(self):
+        # every vertex shares the same (read-only) coin block
+        qw = hpw.Coined(hpw.Graph([[1]]))
+        C = qw.get_coin()
+        self.assertTrue(C.shape == (1, 1))
+
+        states = qw.simulate(3, qw.ket(0))
+        self.assertTrue(np.allclose(np.abs(states), 1))
+
+    def test_simulate_renormalization(self):
+        init_state = self.qw.ket((0, 1))
+
+        # chunks of the same length (step is a multiple of renorm_every)
+        # and of different lengths
+        for range_, renorm_every in [((0, 40, 4), 2), ((1, 40, 7), 3)]:
+            states = self.qw.simulate(range_, init_state)
+            renorm = self.qw.simulate(range_, init_state,
+                                      renorm_every=renorm_every)
+            norms = np.linalg.norm(states, axis=1)[:, None]
+            self.assertTrue(np.allclose(renorm, states / norms))
+
+    def test_simulate_renormalization_matrix_power(self):
+        # small evolution operator and large steps,
+        # the chunks are applied with matrix powers
+        qw = hpw.Coined(hpw.Complete(3))
+        init_state = qw.uniform_state()
+
+        states = qw.simulate((0, 3000, 250), init_state)
+        renorm = qw.simulate((0, 3000, 250), init_state, renorm_every=100)
+        norms = np.linalg.norm(states, axis=1)[:, None]
+        self.assertTrue(np.allclose(renorm, states / norms))
+
+    def test_grover_coin_isolated_vertex(self):
+        # the block of a vertex without neighbors is empty
+        adj = np.zeros((3, 3))
+        adj[0, 1] = adj[1, 0] = 1
+        qw = hpw.Coined(hpw.Graph(adj), coin='grover')
+        C = qw.get_coin()
+        self.assertTrue(C.shape == (2, 2))
+
+    def test_simulation_attributes_reset_after_early_stop(self):
+        init_state = self.qw.ket((0, 1))
+        states = self.qw._simulate_states((0, 10), init_state)
+        next(states)
+        next(states)
+        self.assertTrue(self.qw._simul_mat is not None)
+
+        # the consumer stops before the last state
+        states.close()
+        self.assertTrue(self.qw._simul_mat is None)
+        self.assertTrue(self.qw._simul_vec is None)
+        self.assertTrue(self.qw._simul_buf is None)
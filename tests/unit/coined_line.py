@@ -57,6 +57,22 @@ class TestCoinedLine(unittest.TestCase):
             final_state[0] == 1 and np.all(final_state[1:] == 0)
         )
 
+    def test_persistent_shift_right_measure(self):
+        # only the probability of the rightmost vertex is returned
+        self.qw.set_shift('persistent')
+        self.qw.set_coin('I')
+        self.qw.set_marked([])
+
+        init_state = self.qw.state([[1, (0, 1)]])
+
+        num_steps = self.num_vert - 1
+        prob = self.qw.simulate((num_steps, num_steps + 1),
+                                init_state,
+                                measure=[self.num_vert - 1])
+
+        self.assertTrue(prob.shape == (1, ))
+        self.assertTrue(np.isclose(prob[0], 1))
+
     @unittest.skipIf(HPC is None, 'Skipping comparison tests between '
                                   'numpy and PyHiperBlas')
     def test_hpc_default_evolution_operator(self):
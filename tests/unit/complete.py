@@ -98,3 +98,30 @@ class TestComplete(unittest.TestCase):
         self.assertTrue(id(adj) == id(wh.adjacency_matrix(False)))
 
         self.assertTrue(np.sum(wg._adj_matrix - wh._adj_matrix) == 0)
+
+    def test_coined_uniform_state_vertices(self):
+        qw = hpw.Coined(self.g)
+        vertices = [0, 3, self.n - 1]
+
+        # explicit construction, arc by arc
+        expected = np.zeros(qw.hilbert_space_dimension())
+        for v in vertices:
+            for u in self.g.neighbors(v):
+                expected[qw._graph.arc_number((v, u))] = 1
+        expected /= np.linalg.norm(expected)
+
+        state = qw.uniform_state(vertices=vertices)
+        self.assertTrue(np.allclose(state, expected))
+
+    def test_coined_invalid_coin_degree(self):
+        # the Hadamard coin requires degrees that are powers of 2,
+        # the degree of the complete graph with 4 vertices is 3
+        g = hpw.Complete(4)
+        with self.assertRaises(ValueError):
+            hpw.Coined(g, coin='hadamard')
+
+        qw = hpw.Coined(g)
+        with self.assertRaises(ValueError):
+            qw.set_coin('hadamard')
+        with self.assertRaises(ValueError):
+            qw.set_marked({'hadamard': [0]})
@@ -105,3 +105,17 @@ class TestCompleteBipartite(unittest.TestCase):
         self.assertTrue(id(adj) == id(wh.adjacency_matrix(False)))
 
         self.assertTrue(np.sum(wg._adj_matrix - wh._adj_matrix) == 0)
+
+    def test_coined_uniform_state_vertices(self):
+        qw = hpw.Coined(self.g)
+        vertices = [0, 3, self.n - 1]
+
+        # explicit construction, arc by arc
+        expected = np.zeros(qw.hilbert_space_dimension())
+        for v in vertices:
+            for u in self.g.neighbors(v):
+                expected[qw._graph.arc_number((v, u))] = 1
+        expected /= np.linalg.norm(expected)
+
+        state = qw.uniform_state(vertices=vertices)
+        self.assertTrue(np.allclose(state, expected))
@@ -1,5 +1,7 @@
 import numpy as np
 import networkx as nx
+import scipy.sparse.linalg
+import scipy.special
 import random
 from sys import path as sys_path
 sys_path.append('../')
@@ -93,6 +95,30 @@ class TestContinuousTime(unittest.TestCase):
             U@U.T.conjugate(), np.eye(U.shape[0])
         ))
 
+    def test_simulate_chebyshev(self):
+        self.qw.set_evolution(time=1, marked=[0])
+        state = self.qw.uniform_state()
+        U = self.qw.get_evolution()
+
+        self.assertTrue(np.allclose(
+            self.qw.simulate_chebyshev(state=state), U @ state
+        ))
+
+    def test_simulate_chebyshev_negative_time(self):
+        # the spectrum of the cycle Hamiltonian is within [-1, 1],
+        # hence the coefficients of the expansion are J_k(time).
+        # J_2(time) == 0 must not stop the expansion.
+        qw = hpw.ContinuousTime(hpw.Cycle(self.num_vert), gamma=1/2)
+        state = qw.ket(0)
+        time = -scipy.special.jn_zeros(2, 1)[0]
+        H = qw.get_hamiltonian()
+        expected = scipy.sparse.linalg.expm_multiply(
+            -1j*time*H, state.astype(complex))
+
+        self.assertTrue(np.allclose(
+            qw.simulate_chebyshev(time, state), expected
+        ))
+
     def test_uniform_state(self):
         # superposition of all vertices
         state = self.qw.uniform_state()
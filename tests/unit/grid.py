@@ -352,3 +352,11 @@ class TestGrid(unittest.TestCase):
         self.assertTrue(id(adj) == id(wh.adjacency_matrix(False)))
 
         self.assertTrue(np.sum(wg._adj_matrix - wh._adj_matrix) == 0)
+
+    def test_zero_dimensional_array_vertex(self):
+        # a 0-d array is a vertex number, not coordinates
+        g = hpw.Grid((3, 3))
+        vertex = np.array(4)
+        self.assertTrue(g._valid_vertex(vertex))
+        self.assertTrue(g.vertex_number(vertex) == 4)
+        self.assertTrue(np.all(g.vertex_coordinates(vertex) == [1, 1]))
@@ -111,3 +111,23 @@ class TestHypercube(unittest.TestCase):
         self.assertTrue(id(adj) == id(wh.adjacency_matrix(False)))
 
         self.assertTrue((wg._adj_matrix - wh._adj_matrix).nnz == 0)
+
+    def test_coined_simulate_by_blocks(self):
+        # regular graph with degree greater than 4:
+        # the coin is applied by blocks during the simulation
+        for coin, marked in [('grover', {'-I': [0, 3]}),
+                             ('fourier', [5])]:
+            qw = hpw.Coined(self.hypercube, coin=coin, marked=marked)
+            init_state = qw.uniform_state()
+
+            states = qw.simulate((0, 10, 3), init_state)
+
+            U = qw.get_evolution()
+            expected = [init_state]
+            for i in range(3):
+                psi = expected[-1]
+                for j in range(3):
+                    psi = U @ psi
+                expected.append(psi)
+
+            self.assertTrue(np.allclose(states, expected))
@@ -0,0 +1,80 @@
+import numpy as np
+from sys import path as sys_path
+sys_path.append('../')
+sys_path.append('../../')
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import hiperwalk as hpw
+import unittest
+
+class TestPlot(unittest.TestCase):
+
+    def setUp(self):
+        self.num_vert = 10
+        self.probs = np.random.rand(3, self.num_vert)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_fast_layout_ignored_by_non_graph_plots(self):
+        for plot in ['bar', 'line', 'histogram']:
+            hpw.plot_probability_distribution(self.probs, plot=plot,
+                                              fast_layout=True,
+                                              show=False)
+
+    def test_graph_animation_update_matches_redraw(self):
+        from hiperwalk.plot import _plot
+        from matplotlib.collections import PathCollection
+
+        def graph_kwargs():
+            kwargs = {'graph': hpw.Cycle(self.num_vert)}
+            _plot._default_graph_kwargs(kwargs, 'graph')
+            _plot._preconfigure_graph_plot(self.probs, kwargs)
+            kwargs['pos'] = {v: (v, 0) for v in range(self.num_vert)}
+            return kwargs
+
+        def nodes(ax):
+            return next(c for c in ax.collections
+                        if isinstance(c, PathCollection))
+
+        # frame updated in place
+        kwargs = graph_kwargs()
+        fig, ax = plt.subplots()
+        ax, cbar = _plot._plot_probability_distribution_on_graph(
+            self.probs[0], ax, **dict(kwargs))
+        _plot._update_animation_graph(self.probs[1], nodes(ax), ax,
+                                      cbar, None, kwargs)
+        fig.canvas.draw()
+
+        # frame redrawn from scratch
+        kwargs2 = graph_kwargs()
+        fig2, ax2 = plt.subplots()
+        ax2, cbar2 = _plot._plot_probability_distribution_on_graph(
+            self.probs[0], ax2, **dict(kwargs2))
+        ax2, cbar2 = _plot._plot_probability_distribution_on_graph(
+            self.probs[1], ax2, cbar=cbar2, **dict(kwargs2))
+        fig2.canvas.draw()
+
+        self.assertTrue(np.array_equal(cbar.get_ticks(), cbar2.get_ticks()))
+        self.assertTrue(
+            [t.get_text() for t in cbar.ax.get_yticklabels()]
+            == [t.get_text() for t in cbar2.ax.get_yticklabels()])
+        self.assertTrue(np.allclose(nodes(ax).get_sizes(),
+                                    nodes(ax2).get_sizes()))
+        self.assertTrue(np.allclose(nodes(ax).get_facecolors(),
+                                    nodes(ax2).get_facecolors()))
+
+    def test_reused_figure_rescaled_without_max_prob(self):
+        # only min_prob is given, every frame is rescaled
+        probs = np.array([[0.1]*self.num_vert,
+                          [0.9] + [0.01]*(self.num_vert - 1)])
+        hpw.plot_probability_distribution(probs, plot='bar', show=False,
+                                          rescale=True, min_prob=0)
+        ylim = plt.gca().get_ylim()
+        plt.close('all')
+
+        hpw.plot_probability_distribution(probs[-1], plot='bar',
+                                          show=False, rescale=True,
+                                          min_prob=0)
+        self.assertTrue(np.allclose(ylim, plt.gca().get_ylim()))